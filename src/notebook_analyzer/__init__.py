@@ -9,28 +9,32 @@ Created on: 2025-02-17
 Last Updated: 2025-02-17 02:35:08
 """
 
-from .analyzers.base_analyzer import BaseAnalyzer
-from .analyzers import (
-    builder_mindset,
-    business_intelligence
-)
-from .reporting import (
-    ReportGenerator,
-    HTMLTemplate,
-    MarkdownTemplate,
+import importlib
+
+# Public attributes are imported on first access (PEP 562) so that importing
+# the package does not load every analyzer, formatter and the CLI up front.
+# Maps attribute name -> (module, attribute in that module)
+_LAZY_ATTRIBUTES = {
+    'BaseAnalyzer': ('.analyzers.base_analyzer', 'BaseAnalyzer'),
+    'builder_mindset': ('.analyzers', 'builder_mindset'),
+    'business_intelligence': ('.analyzers', 'business_intelligence'),
+    'ReportGenerator': ('.reporting', 'ReportGenerator'),
+    'HTMLTemplate': ('.reporting', 'HTMLTemplate'),
+    'MarkdownTemplate': ('.reporting', 'MarkdownTemplate'),
     # Builder Mindset Formatters
-    CodeFormattingFormatter,
-    CodeStructureFormatter,
-    CodeCommentsFormatter,
-    CodeConcisenessFormatter,
-    CodeReusabilityFormatter,
-    AdvancedTechniquesFormatter,
-    DatasetJoinFormatter,
+    'CodeFormattingFormatter': ('.reporting', 'CodeFormattingFormatter'),
+    'CodeStructureFormatter': ('.reporting', 'CodeStructureFormatter'),
+    'CodeCommentsFormatter': ('.reporting', 'CodeCommentsFormatter'),
+    'CodeConcisenessFormatter': ('.reporting', 'CodeConcisenessFormatter'),
+    'CodeReusabilityFormatter': ('.reporting', 'CodeReusabilityFormatter'),
+    'AdvancedTechniquesFormatter': ('.reporting', 'AdvancedTechniquesFormatter'),
+    'DatasetJoinFormatter': ('.reporting', 'DatasetJoinFormatter'),
     # Business Intelligence Formatters
-    VisualizationTypesFormatter,
-    VisualizationFormattingFormatter
-)
-from .cli.main import main
+    'VisualizationTypesFormatter': ('.reporting', 'VisualizationTypesFormatter'),
+    'VisualizationFormattingFormatter': ('.reporting', 'VisualizationFormattingFormatter'),
+    # CLI
+    'main': ('.cli.main', 'main')
+}
 
 __all__ = [
     # Core components
@@ -100,6 +104,32 @@ PACKAGE_INFO = {
     }
 }
 
+def __getattr__(name: str):
+    """
+    Import a public attribute on first access.
+
+    Args:
+        name (str): Name of the attribute
+
+    Returns:
+        Any: The requested attribute
+
+    Raises:
+        AttributeError: If the package has no such attribute
+    """
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+def __dir__():
+    """List module attributes, including those not imported yet."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 def get_version() -> str:
     """Get the package version."""
     return __version__
@@ -119,6 +149,8 @@ def create_analyzer(category: str = None) -> 'BaseAnalyzer':
     Returns:
         BaseAnalyzer: Configured analyzer instance
     """
+    from .analyzers import BaseAnalyzer, builder_mindset, business_intelligence
+
     if category == 'builder_mindset':
         return builder_mindset.create_analyzer()
     elif category == 'business_intelligence':
@@ -10,7 +10,7 @@ Last Updated: 2025-02-17 22:51:46
 """
 
 from .base_analyzer import BaseAnalyzer, AnalysisError
-from ..core.analysis_orchestrator import AnalysisOrchestrator
+from .analysis_context import AnalysisContext
 from .builder_mindset import (  # Explicit imports for better code completion
     CodeFormattingAnalyzer,
     CodeStructureAnalyzer,
@@ -31,6 +31,7 @@ __all__ = [
     # Base classes
     'BaseAnalyzer',
     'AnalysisError',
+    'AnalysisContext',
     'NotebookAnalyzer',  # Added to exports
     
     # Categories
@@ -0,0 +1,64 @@
+"""
+Analysis Context Module.
+
+This module provides the shared context handed to every analyzer that looks
+at the same piece of code, so the code is parsed and tokenized only once.
+
+Created by: Barrhann
+Created on: 2025-02-17
+"""
+
+import ast
+import io
+import tokenize
+from functools import cached_property
+from typing import List
+
+
+class AnalysisContext:
+    """
+    Lazily computed representations of the code under analysis.
+
+    Attributes:
+        code (str): The code being analyzed
+
+    Properties:
+        tree (ast.Module): Abstract syntax tree of the code
+        tokens (List[tokenize.TokenInfo]): Token stream of the code
+    """
+
+    def __init__(self, code: str):
+        """
+        Initialize the analysis context.
+
+        Args:
+            code (str): The code being analyzed
+        """
+        self.code = code
+
+    @cached_property
+    def tree(self) -> ast.Module:
+        """
+        Parse the code on first access.
+
+        Trees are not cached beyond the context: visitors add parent links
+        to them, and parsing is a small share of the analysis time.
+
+        Raises:
+            SyntaxError: If the code cannot be parsed
+        """
+        return ast.parse(self.code)
+
+    @cached_property
+    def tokens(self) -> List[tokenize.TokenInfo]:
+        """
+        Tokenize the code on first access.
+
+        Raises:
+            tokenize.TokenError: If the code cannot be tokenized
+        """
+        return list(tokenize.generate_tokens(io.StringIO(self.code).readline))
+
+    def __repr__(self) -> str:
+        """Return detailed string representation of the context."""
+        return f"AnalysisContext(length={len(self.code)})"
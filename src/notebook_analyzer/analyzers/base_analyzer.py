@@ -8,10 +8,23 @@ Created by: Barrhann
 Date: 2025-02-17
 """
 
+import concurrent.futures
+import copy
+import functools
+import hashlib
+import os
+import pickle
+import stat
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 
+from .analysis_context import AnalysisContext
+from .workers import analyze_cell
+
 class AnalysisError(Exception):
     """Custom exception for analyzer-related errors."""
     pass
@@ -24,16 +37,34 @@ class BaseAnalyzer(ABC):
     common utility methods for analysis tasks. Each analyzer should focus on a specific
     aspect of the notebook analysis (e.g., code structure, visualization, etc.).
 
+    Analyzers that opt in can cache their results by source hash through
+    _cache_key, _get_cached_result and _store_cached_result. Results are kept
+    in memory; setting the NA_CACHE_DIR environment variable additionally
+    persists them to that directory, keeping the DISK_CACHE_SIZE most
+    recently used files. Keys include a fingerprint of the analyzer's source,
+    so results from before a code change are not reused.
+    Results hold sets and tuples that JSON cannot round-trip, so they are
+    pickled; cached files are only loaded from a directory owned by the
+    current user that nobody else can write to.
+
     Attributes:
         name (str): The name of the analyzer
         created_at (datetime): Timestamp when the analyzer was instantiated
         last_analysis (datetime): Timestamp of the last analysis performed
+        CACHE_SIZE (int): Number of results kept in the in-memory cache
+        DISK_CACHE_SIZE (int): Number of files kept in the disk cache, shared
+            by all analyzers
+        REQUIRED_RESULT_KEYS (frozenset): Keys every analysis result must have
         
     Properties:
         is_active (bool): Indicates if the analyzer is currently active
         analysis_count (int): Number of analyses performed by this analyzer
     """
 
+    CACHE_SIZE = 128
+    DISK_CACHE_SIZE = 4096
+    REQUIRED_RESULT_KEYS = frozenset({'score', 'findings', 'details'})
+
     def __init__(self, name: str):
         """
         Initialize the base analyzer.
@@ -52,6 +83,8 @@ class BaseAnalyzer(ABC):
         self.last_analysis = None
         self._analysis_count = 0
         self._is_active = True
+        self._cache = OrderedDict()
+        self._disk_cache_dir = os.environ.get('NA_CACHE_DIR')
 
     @property
     def is_active(self) -> bool:
@@ -64,12 +97,16 @@ class BaseAnalyzer(ABC):
         return self._analysis_count
 
     @abstractmethod
-    def analyze(self, code: str) -> Dict[str, Any]:
+    def analyze(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze the provided code and return analysis results.
 
         Args:
             code (str): The code to analyze
+            context (Optional[AnalysisContext]): Shared parse/tokenize results
+                for the code, created on demand when not provided
 
         Returns:
             Dict[str, Any]: Analysis results containing metrics and findings
@@ -117,20 +154,26 @@ class BaseAnalyzer(ABC):
         Returns:
             bool: True if results are valid, False otherwise
         """
-        required_keys = {'score', 'findings', 'details'}
         return (
             isinstance(results, dict) and
-            all(key in results for key in required_keys) and
+            results.keys() >= self.REQUIRED_RESULT_KEYS and
             isinstance(results['score'], (int, float)) and
             0 <= results['score'] <= 100
         )
 
-    def prepare_analysis(self, code: str) -> None:
+    def prepare_analysis(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> AnalysisContext:
         """
         Prepare for analysis by validating input and updating state.
 
         Args:
             code (str): The code to be analyzed
+            context (Optional[AnalysisContext]): Context shared with other
+                analyzers of the same code
+
+        Returns:
+            AnalysisContext: The given context, or a new one for the code
 
         Raises:
             ValueError: If code is invalid
@@ -141,9 +184,226 @@ class BaseAnalyzer(ABC):
         
         if not self.validate_input(code):
             raise ValueError("Invalid or empty code provided")
+
+        if context is None:
+            context = AnalysisContext(code)
+        elif context.code is not code and context.code != code:
+            raise ValueError("Analysis context does not match the provided code")
             
         self.last_analysis = datetime.utcnow()
         self._analysis_count += 1
+        return context
+
+    @staticmethod
+    def _weighted_score(scores: Iterable[float], weights: Iterable[float]) -> float:
+        """
+        Combine component scores into an overall score.
+
+        Args:
+            scores (Iterable[float]): Component scores (0-100)
+            weights (Iterable[float]): Weight of each score, in the same order;
+                the weights sum to 1, so the result is not normalized
+
+        Returns:
+            float: Weighted score (0-100), rounded to two decimals
+        """
+        return round(sum(score * weight for score, weight in zip(scores, weights)), 2)
+
+    @staticmethod
+    def _may_mention(code: str, names: Iterable[str]) -> bool:
+        """
+        Check whether the code could refer to any of the given names.
+
+        Analyzers use this to skip walking trees that cannot contain anything
+        they look for.
+
+        Args:
+            code (str): The code to check
+            names (Iterable[str]): Names to look for in the source text
+
+        Returns:
+            bool: False only if none of the names appears in the code
+        """
+        # Non-ASCII identifiers are NFKC-normalized by the parser, so they
+        # may spell a name that is not in the source text
+        if not code.isascii():
+            return True
+        return any(name in code for name in names)
+
+    def analyze_cells(self, codes: List[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze several independent code cells in parallel.
+
+        Each cell is analyzed by a fresh analyzer of the same type in a worker
+        process, so the work is not serialized by the GIL.
+
+        Args:
+            codes (List[str]): Source code of each cell
+            workers (Optional[int]): Number of worker processes (default: CPU count)
+
+        Returns:
+            List[Dict[str, Any]]: Analysis results, in the same order as codes
+
+        Raises:
+            AnalysisError: If analysis of any cell fails
+            ValueError: If any cell is invalid
+        """
+        if not codes:
+            return []
+
+        analyze = functools.partial(analyze_cell, type(self))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(analyze, codes))
+
+    def _cache_config(self) -> Tuple[Any, ...]:
+        """
+        Get the analyzer settings that affect its results.
+
+        Analyzers that cache results override this to return their thresholds
+        and weights, so that changing them invalidates previously cached results.
+
+        Returns:
+            Tuple[Any, ...]: Settings included in the cache key
+        """
+        return ()
+
+    def _cache_key(self, code: str) -> bytes:
+        """
+        Build the cache key for a piece of code.
+
+        Args:
+            code (str): The code to analyze
+
+        Returns:
+            bytes: Digest identifying the analyzer, its code and configuration,
+                and the code being analyzed
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((
+            type(self).__name__, _source_fingerprint(type(self)), self._cache_config()
+        )).encode('utf-8'))
+        digest.update(code.encode('utf-8', 'surrogatepass'))
+        return digest.digest()
+
+    def _get_cached_result(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached analysis result.
+
+        Args:
+            key (bytes): Cache key from _cache_key
+
+        Returns:
+            Optional[Dict[str, Any]]: Copy of the cached results, or None on a miss
+        """
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return copy.deepcopy(self._cache[key])
+
+        if self._disk_cache_dir:
+            cache_dir = Path(self._disk_cache_dir)
+            path = cache_dir / f"{key.hex()}.pkl"
+            try:
+                # Unpickling runs code, so only trust files no one else could write
+                if not (_is_private(cache_dir) and _is_private(path)):
+                    return None
+                with open(path, 'rb') as f:
+                    results = pickle.load(f)
+                os.utime(path)  # Recently used files are pruned last
+            except (OSError, pickle.UnpicklingError, EOFError):
+                return None
+            self._remember(key, results)
+            return copy.deepcopy(results)
+
+        return None
+
+    def _store_cached_result(self, key: bytes, results: Dict[str, Any]) -> None:
+        """
+        Store analysis results in the cache.
+
+        Args:
+            key (bytes): Cache key from _cache_key
+            results (Dict[str, Any]): Analysis results to cache
+        """
+        results = copy.deepcopy(results)
+        self._remember(key, results)
+
+        if self._disk_cache_dir:
+            try:
+                cache_dir = Path(self._disk_cache_dir)
+                cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+                if not _is_private(cache_dir):
+                    return  # Entries here would never be loaded
+                fd = os.open(
+                    cache_dir / f"{key.hex()}.pkl",
+                    os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                    0o600
+                )
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(results, f)
+                _prune_disk_cache(cache_dir, self.DISK_CACHE_SIZE)
+            except OSError:
+                pass  # The disk cache is best effort
+
+    def _remember(self, key: bytes, results: Dict[str, Any]) -> None:
+        """
+        Add results to the in-memory cache, evicting the oldest entry if full.
+
+        Args:
+            key (bytes): Cache key from _cache_key
+            results (Dict[str, Any]): Analysis results to cache
+        """
+        self._cache[key] = results
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Drop all results from the in-memory cache."""
+        self._cache.clear()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Get the state to pickle.
+
+        Analyzers are pickled to run in worker processes. An analyzer leaves
+        its in-memory cache behind, while an unpickled copy only holds the
+        results it cached itself and sends them back for merge_state.
+
+        Returns:
+            Dict[str, Any]: Instance attributes, with an empty cache unless
+                this analyzer is a copy
+        """
+        state = self.__dict__.copy()
+        if not state.pop('_is_copy', False):
+            state['_cache'] = OrderedDict()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a pickled analyzer, marking it as a copy.
+
+        Args:
+            state (Dict[str, Any]): Instance attributes from __getstate__
+        """
+        self.__dict__.update(state)
+        self._is_copy = True
+
+    def merge_state(self, other: 'BaseAnalyzer') -> None:
+        """
+        Take over the state of a copy of this analyzer that ran elsewhere.
+
+        Counters, timestamps and metrics come from the copy, and the results
+        it cached are added to this analyzer's in-memory cache.
+
+        Args:
+            other (BaseAnalyzer): Copy of this analyzer, e.g. from a worker process
+        """
+        cache = self._cache
+        self.__dict__.update(other.__dict__)
+        self.__dict__.pop('_is_copy', None)
+        self._cache = cache
+        for key, results in other._cache.items():
+            self._remember(key, results)
 
     def get_metadata(self) -> Dict[str, Any]:
         """
@@ -178,3 +438,77 @@ class BaseAnalyzer(ABC):
         """Return detailed string representation of the analyzer."""
         return (f"{self.__class__.__name__}(name='{self.name}', "
                 f"active={self.is_active}, analyses={self.analysis_count})")
+
+
+@functools.lru_cache(maxsize=None)
+def _source_fingerprint(analyzer_type: type) -> str:
+    """
+    Fingerprint the source of the modules defining an analyzer class and its bases.
+
+    Args:
+        analyzer_type (type): BaseAnalyzer subclass
+
+    Returns:
+        str: Digest of the module sources, computed once per class
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    seen = set()
+    for cls in analyzer_type.__mro__:
+        if cls.__module__ in seen:
+            continue
+        seen.add(cls.__module__)
+        digest.update(cls.__module__.encode('utf-8'))
+        path = getattr(sys.modules.get(cls.__module__), '__file__', None)
+        if path:
+            try:
+                digest.update(Path(path).read_bytes())
+            except OSError:
+                pass  # Source not available; only the module name counts
+    return digest.hexdigest()
+
+
+def _prune_disk_cache(cache_dir: Path, keep: int) -> None:
+    """
+    Delete the least recently used files from the disk cache.
+
+    Args:
+        cache_dir (Path): Disk cache directory
+        keep (int): Number of files to keep
+
+    Raises:
+        OSError: If the directory cannot be listed
+    """
+    with os.scandir(cache_dir) as entries:
+        files = [
+            (entry.stat().st_mtime, entry.path)
+            for entry in entries
+            if entry.name.endswith('.pkl') and entry.is_file(follow_symlinks=False)
+        ]
+    if len(files) <= keep:
+        return
+
+    files.sort()
+    for _, path in files[:len(files) - keep]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass  # Already removed by another process
+
+
+def _is_private(path: Path) -> bool:
+    """
+    Check that a path is owned by the current user and not writable by others.
+
+    Args:
+        path (Path): File or directory to check
+
+    Returns:
+        bool: True if only the current user can have written to the path
+
+    Raises:
+        OSError: If the path cannot be inspected
+    """
+    status = path.stat()
+    if hasattr(os, 'getuid') and status.st_uid != os.getuid():
+        return False
+    return not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
@@ -112,7 +112,7 @@ def get_package_info():
         analyzer_info.append({
             'name': instance.name,
             'type': 'builder_mindset',
-            'description': instance.__doc__.split('\n')[0] if instance.__doc__ else 'No description'
+            'description': instance.__doc__.partition('\n')[0] if instance.__doc__ else 'No description'
         })
     
     return {
@@ -10,24 +10,26 @@ Last Updated: 2025-02-17 23:54:15
 """
 
 import ast
-from typing import Dict, Any, List, Set, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from collections import defaultdict
 from ..base_analyzer import BaseAnalyzer, AnalysisError
+from ..analysis_context import AnalysisContext
+from ..node_visitor import CachedNodeVisitor
 
 
 class AdvancedFeatures:
     """Constants for advanced technique analysis."""
     
     # Advanced Python features to detect
-    ADVANCED_DECORATORS = {
+    ADVANCED_DECORATORS = frozenset({
         'property', 'classmethod', 'staticmethod', 'abstractmethod',
         'contextmanager', 'cached_property'
-    }
+    })
     
-    ADVANCED_METHODS = {
+    ADVANCED_METHODS = frozenset({
         '__enter__', '__exit__', '__iter__', '__next__',
         '__getitem__', '__setitem__', '__call__'
-    }
+    })
     
     DESIGN_PATTERNS = {
         'Factory': {'create', 'factory', 'build'},
@@ -53,7 +55,14 @@ class AdvancedFeatures:
     }
 
 
-class AdvancedTechniquesVisitor(ast.NodeVisitor):
+# Design pattern keywords in lowercase, built once at import
+_DESIGN_PATTERN_KEYWORDS = tuple(
+    (pattern, tuple(keyword.lower() for keyword in keywords))
+    for pattern, keywords in AdvancedFeatures.DESIGN_PATTERNS.items()
+)
+
+
+class AdvancedTechniquesVisitor(CachedNodeVisitor):
     """Visitor for analyzing advanced programming techniques."""
 
     def __init__(self):
@@ -190,15 +199,17 @@ class AdvancedTechniquesVisitor(ast.NodeVisitor):
         Args:
             node (ast.ClassDef): The class definition node
         """
-        class_src = ast.dump(node)
+        # Lowercase the name and source once rather than once per keyword
+        class_name = node.name.lower()
+        class_src = ast.dump(node).lower()
         
-        for pattern, keywords in AdvancedFeatures.DESIGN_PATTERNS.items():
-            if any(keyword.lower() in node.name.lower() for keyword in keywords):
+        for pattern, keywords in _DESIGN_PATTERN_KEYWORDS:
+            if any(keyword in class_name for keyword in keywords):
                 self.patterns[pattern].append({
                     'class': node.name,
                     'line': node.lineno
                 })
-            elif any(keyword.lower() in class_src.lower() for keyword in keywords):
+            elif any(keyword in class_src for keyword in keywords):
                 self.patterns[pattern].append({
                     'class': node.name,
                     'line': node.lineno
@@ -230,16 +241,37 @@ class AdvancedTechniquesAnalyzer(BaseAnalyzer):
             'optimizations': []
         }
 
+    def _cache_config(self) -> Tuple[Any, ...]:
+        """
+        Get the analyzer settings that affect its results.
+
+        Returns:
+            Tuple[Any, ...]: Settings included in the cache key
+        """
+        return (
+            sorted(AdvancedFeatures.ADVANCED_DECORATORS),
+            sorted(AdvancedFeatures.ADVANCED_METHODS),
+            tuple((pattern, sorted(keywords)) for pattern, keywords in
+                  AdvancedFeatures.DESIGN_PATTERNS.items()),
+            tuple((feature, sorted(keywords)) for feature, keywords in
+                  AdvancedFeatures.OPTIMIZATION_FEATURES.items()),
+            tuple(AdvancedFeatures.PATTERN_WEIGHTS.items())
+        )
+
     def get_metric_type(self) -> str:
         """Get the type of metric this analyzer produces."""
         return 'builder_mindset'
 
-    def analyze(self, code: str) -> Dict[str, Any]:
+    def analyze(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze advanced programming techniques.
 
         Args:
             code (str): The code to analyze
+            context (Optional[AnalysisContext]): Parse results shared with
+                other analyzers of the same code
 
         Returns:
             Dict[str, Any]: Analysis results containing:
@@ -253,12 +285,19 @@ class AdvancedTechniquesAnalyzer(BaseAnalyzer):
             ValueError: If code is invalid
         """
         try:
-            self.prepare_analysis(code)
+            context = self.prepare_analysis(code, context)
+
+            cache_key = self._cache_key(code)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                self.metrics = cached['details']['metrics']
+                return cached
+
             self._reset_metrics()
 
             # Parse the code
             try:
-                tree = ast.parse(code)
+                tree = context.tree
             except SyntaxError as e:
                 raise AnalysisError(f"Syntax error in code: {str(e)}")
 
@@ -273,12 +312,9 @@ class AdvancedTechniquesAnalyzer(BaseAnalyzer):
             optimization_score = self._calculate_optimization_score(visitor.optimizations)
 
             # Calculate overall score
-            overall_score = self._calculate_overall_score([
-                (decorator_score, AdvancedFeatures.PATTERN_WEIGHTS['decorators']),
-                (method_score, AdvancedFeatures.PATTERN_WEIGHTS['magic_methods']),
-                (pattern_score, AdvancedFeatures.PATTERN_WEIGHTS['design_patterns']),
-                (optimization_score, AdvancedFeatures.PATTERN_WEIGHTS['optimizations'])
-            ])
+            overall_score = self._calculate_overall_score((
+                decorator_score, method_score, pattern_score, optimization_score
+            ))
 
             # Store metrics
             self.metrics['decorators'] = visitor.decorators
@@ -303,6 +339,7 @@ class AdvancedTechniquesAnalyzer(BaseAnalyzer):
             if not self.validate_results(results):
                 raise AnalysisError("Invalid analysis results generated")
 
+            self._store_cached_result(cache_key, results)
             return results
 
         except Exception as e:
@@ -372,24 +409,17 @@ class AdvancedTechniquesAnalyzer(BaseAnalyzer):
         unique_optimizations = len({o['type'] for o in optimizations})
         return min(100, 50 + (unique_optimizations * 15))
 
-    def _calculate_overall_score(self, scores_and_weights: List[tuple[float, float]]) -> float:
+    def _calculate_overall_score(self, scores: Tuple[float, ...]) -> float:
         """
         Calculate weighted average score.
 
         Args:
-            scores_and_weights: List of (score, weight) tuples
+            scores: Component scores, in the order of PATTERN_WEIGHTS
 
         Returns:
             float: Weighted average score (0-100)
         """
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for score, weight in scores_and_weights:
-            total_score += score * weight
-            total_weight += weight
-            
-        return round(total_score / total_weight if total_weight > 0 else 0, 2)
+        return self._weighted_score(scores, AdvancedFeatures.PATTERN_WEIGHTS.values())
 
     def _generate_findings(self, visitor: AdvancedTechniquesVisitor) -> List[str]:
         """
@@ -461,7 +491,7 @@ class AdvancedTechniquesAnalyzer(BaseAnalyzer):
 
     def __str__(self) -> str:
         """Return string representation of the analyzer."""
-        return f"Advanced Techniques Analyzer"
+        return "Advanced Techniques Analyzer"
 
     def __repr__(self) -> str:
         """Return detailed string representation of the analyzer."""
@@ -10,9 +10,92 @@ Date: 2025-02-17
 """
 
 import ast
-from typing import Dict, Any, List, Tuple, Set
+import functools
+import tokenize
+from typing import Dict, Any, Callable, List, Tuple, Set, Optional
 import re
 from ..base_analyzer import BaseAnalyzer, AnalysisError
+from ..analysis_context import AnalysisContext
+from ..node_visitor import CachedNodeVisitor
+
+# Tokens after which a string literal starts a new statement (i.e. is a docstring)
+_STATEMENT_START_TOKENS = {None, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT}
+
+# Tokens that carry no code of their own
+_LAYOUT_TOKENS = {tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT}
+
+# A '#' followed by a lowercase letter or a special character; searched for
+# anywhere in the comment, so one comment can have both issues
+_LOWERCASE_START = re.compile(r'#\s*[a-z]')
+_SPECIAL_START = re.compile(r'#\s*[^a-zA-Z0-9\s]')
+
+
+class _DocVisitor(CachedNodeVisitor):
+    """Visitor collecting docstring statistics for modules, classes and functions."""
+
+    def __init__(self, min_length: int, report: Callable[[str], None]):
+        """
+        Initialize the docstring visitor.
+
+        Args:
+            min_length (int): Minimum length of a docstring
+            report (Callable[[str], None]): Called with each issue message
+        """
+        self.min_length = min_length
+        self.report = report
+        self.count = 0
+        self.short = 0
+        self.missing = 0
+
+    def _check(self, node: ast.AST) -> None:
+        """
+        Record docstring presence and length for a documentable node.
+
+        Args:
+            node (ast.AST): Module, class or function node
+        """
+        body = node.body
+        docstring = None
+        if (body and isinstance(body[0], ast.Expr)
+                and isinstance(body[0].value, ast.Constant)
+                and isinstance(body[0].value.value, str)):
+            docstring = body[0].value.value
+
+        if docstring:
+            self.count += 1
+            if len(docstring.strip()) < self.min_length:
+                self.short += 1
+                self.report(f"Short docstring in {node.__class__.__name__}")
+        else:
+            self.missing += 1
+            self.report(f"Missing docstring in {node.__class__.__name__}")
+
+    def visit_Module(self, node: ast.Module):
+        """Visit the module node."""
+        self._check(node)
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        """Visit class definition nodes."""
+        self._check(node)
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        """Visit function definition nodes."""
+        self._check(node)
+        self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        """Visit async function definition nodes."""
+        self._check(node)
+        self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST):
+        """Visit child statements only; expressions cannot hold definitions."""
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, ast.expr):
+                self.visit(child)
+
 
 class CodeCommentsAnalyzer(BaseAnalyzer):
     """
@@ -29,11 +112,16 @@ class CodeCommentsAnalyzer(BaseAnalyzer):
         MIN_DOCSTRING_LENGTH (int): Minimum recommended docstring length
         MAX_COMMENT_LENGTH (int): Maximum recommended comment length
         IDEAL_COMMENT_RATIO (float): Ideal ratio of comments to code
+        ISSUE_SAMPLE_SIZE (int): Number of issue messages kept per category
+        SCORE_WEIGHTS (Tuple[float, ...]): Weights of the docstring, inline comment,
+            comment quality, documentation style and comment ratio scores
     """
 
     MIN_DOCSTRING_LENGTH = 10
     MAX_COMMENT_LENGTH = 100
     IDEAL_COMMENT_RATIO = 0.2  # 20% comments to code ratio
+    ISSUE_SAMPLE_SIZE = 16
+    SCORE_WEIGHTS = (0.35, 0.25, 0.20, 0.10, 0.10)
 
     def __init__(self):
         """Initialize the code comments analyzer."""
@@ -42,6 +130,8 @@ class CodeCommentsAnalyzer(BaseAnalyzer):
 
     def _reset_metrics(self) -> None:
         """Reset all metrics for a new analysis."""
+        # Per-line issue lists keep the first ISSUE_SAMPLE_SIZE messages;
+        # issue_counts holds the full totals used for scoring
         self.metrics = {
             'docstring_coverage': [],
             'inline_comments': [],
@@ -49,6 +139,11 @@ class CodeCommentsAnalyzer(BaseAnalyzer):
             'documentation_style': [],
             'comment_ratios': []
         }
+        self.issue_counts = {
+            'docstring_coverage': 0,
+            'inline_comments': 0,
+            'comment_quality': 0
+        }
         self.docstring_count = 0
         self.comment_count = 0
         self.code_lines = 0
@@ -57,12 +152,16 @@ class CodeCommentsAnalyzer(BaseAnalyzer):
         """Get the type of metric this analyzer produces."""
         return 'builder_mindset'
 
-    def analyze(self, code: str) -> Dict[str, Any]:
+    def analyze(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze code comments and documentation.
 
         Args:
             code (str): The code to analyze
+            context (Optional[AnalysisContext]): Parse results shared with
+                other analyzers of the same code
 
         Returns:
             Dict[str, Any]: Analysis results containing:
@@ -76,30 +175,39 @@ class CodeCommentsAnalyzer(BaseAnalyzer):
             ValueError: If code is invalid
         """
         try:
-            self.prepare_analysis(code)
+            context = self.prepare_analysis(code, context)
+
+            cache_key = self._cache_key(code)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                self.metrics = cached['details']['metrics']
+                return cached
+
             self._reset_metrics()
 
             # Parse the code
             try:
-                tree = ast.parse(code)
+                tree = context.tree
             except SyntaxError as e:
                 raise AnalysisError(f"Syntax error in code: {str(e)}")
 
+            # Tokenize once and share the scan across all checks
+            scan = self._scan(context)
+
             # Perform various documentation checks
+            self._check_comments(scan['comments'])
             docstring_score = self._analyze_docstrings(tree)
-            inline_score = self._analyze_inline_comments(code)
-            quality_score = self._analyze_comment_quality(code)
-            style_score = self._analyze_documentation_style(code)
-            ratio_score = self._analyze_comment_ratio(code)
+            inline_score = self._analyze_inline_comments()
+            quality_score = self._analyze_comment_quality()
+            style_score = self._analyze_documentation_style(scan['doc_styles'])
+            ratio_score = self._analyze_comment_ratio(
+                scan['code_lines'], scan['comment_lines']
+            )
 
             # Calculate overall score
-            overall_score = self._calculate_overall_score([
-                (docstring_score, 0.35),  # 35% weight
-                (inline_score, 0.25),     # 25% weight
-                (quality_score, 0.20),    # 20% weight
-                (style_score, 0.10),      # 10% weight
-                (ratio_score, 0.10)       # 10% weight
-            ])
+            overall_score = self._calculate_overall_score((
+                docstring_score, inline_score, quality_score, style_score, ratio_score
+            ))
 
             # Prepare results
             results = {
@@ -111,6 +219,7 @@ class CodeCommentsAnalyzer(BaseAnalyzer):
                     'comment_quality_score': quality_score,
                     'documentation_style_score': style_score,
                     'comment_ratio_score': ratio_score,
+                    'issue_counts': self.issue_counts,
                     'metrics': self.metrics
                 },
                 'suggestions': self._generate_suggestions()
@@ -119,11 +228,26 @@ class CodeCommentsAnalyzer(BaseAnalyzer):
             if not self.validate_results(results):
                 raise AnalysisError("Invalid analysis results generated")
 
+            self._store_cached_result(cache_key, results)
             return results
 
         except Exception as e:
             raise AnalysisError(f"Error analyzing code comments: {str(e)}")
 
+    def _cache_config(self) -> Tuple[Any, ...]:
+        """
+        Get the analyzer settings that affect its results.
+
+        Returns:
+            Tuple[Any, ...]: Settings included in the cache key
+        """
+        return (
+            self.MIN_DOCSTRING_LENGTH,
+            self.MAX_COMMENT_LENGTH,
+            self.IDEAL_COMMENT_RATIO,
+            self.SCORE_WEIGHTS
+        )
+
     def _analyze_docstrings(self, tree: ast.AST) -> float:
         """
         Analyze presence and quality of docstrings.
@@ -134,165 +258,187 @@ class CodeCommentsAnalyzer(BaseAnalyzer):
         Returns:
             float: Docstring quality score (0-100)
         """
-        issues = []
-        docstring_nodes = []
-
-        # Collect all nodes that should have docstrings
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef)):
-                docstring = ast.get_docstring(node)
-                if docstring:
-                    self.docstring_count += 1
-                    if len(docstring.strip()) < self.MIN_DOCSTRING_LENGTH:
-                        issues.append(f"Short docstring in {node.__class__.__name__}")
-                    docstring_nodes.append((node, docstring))
-                else:
-                    issues.append(f"Missing docstring in {node.__class__.__name__}")
+        visitor = _DocVisitor(
+            self.MIN_DOCSTRING_LENGTH,
+            functools.partial(self._record_issue, 'docstring_coverage')
+        )
+        visitor.visit(tree)
 
         # Calculate coverage score
-        if not docstring_nodes and not issues:
+        total = visitor.count + visitor.missing
+        if not total:
             return 100.0  # No documentable nodes found
-        
-        coverage = self.docstring_count / (len(docstring_nodes) + len(issues))
-        score = coverage * 100
 
-        self.metrics['docstring_coverage'].extend(issues)
-        return score
+        self.docstring_count += visitor.count
+        coverage = visitor.count / total
+        return coverage * 100
 
-    def _analyze_inline_comments(self, code: str) -> float:
+    def _scan(self, context: AnalysisContext) -> Dict[str, Any]:
         """
-        Analyze inline comments for quality and relevance.
+        Walk the code's tokens once and collect comment and docstring information.
+
+        Using the tokenizer means '#' characters inside string literals are
+        not mistaken for comments.
 
         Args:
-            code (str): Code to analyze
+            context (AnalysisContext): Context holding the code's tokens
 
         Returns:
-            float: Inline comments score (0-100)
+            Dict[str, Any]: Scan results containing:
+                - comments: List of (line number, comment, preceding code) tuples
+                - code_lines: Number of lines containing code
+                - comment_lines: Number of lines containing a comment
+                - doc_styles: Set of docstring quote styles used
         """
-        lines = code.splitlines()
-        issues = []
-        
-        for i, line in enumerate(lines, 1):
-            # Skip empty lines and docstrings
-            if not line.strip() or line.strip().startswith('"""'):
+        code = context.code
+        if '#' not in code and '"""' not in code and "'''" not in code:
+            # No comments or docstrings to find, so skip tokenizing and
+            # count the non-blank lines as code
+            return {
+                'comments': [],
+                'code_lines': sum(1 for line in code.split('\n') if line.strip()),
+                'comment_lines': 0,
+                'doc_styles': set()
+            }
+
+        comments = []
+        code_rows = set()
+        doc_styles = set()
+        prev_type = None
+
+        for token in context.tokens:
+            token_type = token.type
+
+            if token_type == tokenize.COMMENT:
+                row, col = token.start
+                comments.append((row, token.string.rstrip(), token.line[:col].strip()))
                 continue
 
-            # Check for inline comments
-            comment_idx = line.find('#')
-            if comment_idx > -1:
-                self.comment_count += 1
-                comment = line[comment_idx:].strip()
-                
-                # Check comment quality
-                if len(comment) <= 2:  # Just # or #_
-                    issues.append(f"Line {i}: Too short comment")
-                elif len(comment) > self.MAX_COMMENT_LENGTH:
-                    issues.append(f"Line {i}: Comment too long")
-                elif comment.strip('#').strip().lower() in {'todo', 'fixme'}:
-                    issues.append(f"Line {i}: TODO/FIXME comment found")
+            if token_type in (tokenize.NL, tokenize.ENDMARKER):
+                continue
 
-        # Calculate score
-        if not issues:
-            return 100.0
-            
-        score = max(0, 100 - (len(issues) * 5))
-        self.metrics['inline_comments'].extend(issues)
-        return score
+            if token_type == tokenize.STRING and prev_type in _STATEMENT_START_TOKENS:
+                quote = token.string.lstrip('rRbBuUfF')[:3]
+                if quote == '"""':
+                    doc_styles.add('double')
+                elif quote == "'''":
+                    doc_styles.add('single')
+
+            if token_type not in _LAYOUT_TOKENS:
+                code_rows.update(range(token.start[0], token.end[0] + 1))
+
+            prev_type = token_type
+
+        return {
+            'comments': comments,
+            'code_lines': len(code_rows),
+            'comment_lines': len(comments),
+            'doc_styles': doc_styles
+        }
+
+    def _record_issue(self, category: str, message: str) -> None:
+        """
+        Count an issue and keep its message if the category's sample is not full.
+
+        Args:
+            category (str): Metrics category of the issue
+            message (str): Issue description
+        """
+        count = self.issue_counts[category]
+        if count < self.ISSUE_SAMPLE_SIZE:
+            self.metrics[category].append(message)
+        self.issue_counts[category] = count + 1
 
-    def _analyze_comment_quality(self, code: str) -> float:
+    def _check_comments(self, comments: List[Tuple[int, str, str]]) -> None:
         """
-        Analyze the quality of comments.
+        Check every comment once for both inline and quality issues.
 
         Args:
-            code (str): Code to analyze
+            comments (List[Tuple[int, str, str]]): Comments collected by _scan
+        """
+        record = self._record_issue
+        max_length = self.MAX_COMMENT_LENGTH
+
+        for i, comment, code_part in comments:
+            self.comment_count += 1
+            length = len(comment)
+
+            # Check comment length and content
+            if length <= 2:  # Just # or #_
+                record('inline_comments', f"Line {i}: Too short comment")
+            elif length > max_length:
+                record('inline_comments', f"Line {i}: Comment too long")
+            elif comment.strip('#').strip().lower() in {'todo', 'fixme'}:
+                record('inline_comments', f"Line {i}: TODO/FIXME comment found")
+
+            # Check for obvious issues
+            if _LOWERCASE_START.search(comment):  # Comment doesn't start with capital
+                record('comment_quality', f"Line {i}: Comment should start with capital letter")
+
+            if _SPECIAL_START.search(comment):  # Special characters
+                record('comment_quality', f"Line {i}: Avoid special characters at start of comment")
+
+            # Check for redundant comments
+            if code_part and comment[1:].strip() == code_part:
+                record('comment_quality', f"Line {i}: Redundant comment")
+
+    def _analyze_inline_comments(self) -> float:
+        """
+        Score inline comments for quality and relevance.
 
         Returns:
-            float: Comment quality score (0-100)
+            float: Inline comments score (0-100)
         """
-        lines = code.splitlines()
-        issues = []
-        
-        for i, line in enumerate(lines, 1):
-            if '#' in line:
-                comment = line[line.find('#'):].strip()
-                
-                # Check for obvious issues
-                if re.search(r'#\s*[a-z]', comment):  # Comment doesn't start with capital
-                    issues.append(f"Line {i}: Comment should start with capital letter")
-                    
-                if re.search(r'#\s*[^a-zA-Z0-9\s]', comment):  # Special characters
-                    issues.append(f"Line {i}: Avoid special characters at start of comment")
-                    
-                # Check for redundant comments
-                code_part = line[:line.find('#')].strip()
-                if code_part and comment[1:].strip() == code_part:
-                    issues.append(f"Line {i}: Redundant comment")
+        issue_count = self.issue_counts['inline_comments']
+        if not issue_count:
+            return 100.0
+        return max(0, 100 - (issue_count * 5))
 
-        # Calculate score
-        if not issues:
+    def _analyze_comment_quality(self) -> float:
+        """
+        Score the quality of comments.
+
+        Returns:
+            float: Comment quality score (0-100)
+        """
+        issue_count = self.issue_counts['comment_quality']
+        if not issue_count:
             return 100.0
-            
-        score = max(0, 100 - (len(issues) * 5))
-        self.metrics['comment_quality'].extend(issues)
-        return score
+        return max(0, 100 - (issue_count * 5))
 
-    def _analyze_documentation_style(self, code: str) -> float:
+    def _analyze_documentation_style(self, doc_styles: Set[str]) -> float:
         """
         Analyze documentation style consistency.
 
         Args:
-            code (str): Code to analyze
+            doc_styles (Set[str]): Docstring quote styles collected by _scan
 
         Returns:
             float: Documentation style score (0-100)
         """
-        issues = []
-        doc_styles = set()
-        
-        # Check docstring style consistency
-        for match in re.finditer(r'""".*?"""|\'\'\'.*?\'\'\'', code, re.DOTALL):
-            docstring = match.group()
-            if docstring.startswith('"""'):
-                doc_styles.add('double')
-            else:
-                doc_styles.add('single')
+        issue_count = 0
 
         if len(doc_styles) > 1:
-            issues.append("Inconsistent docstring quote style")
+            self.metrics['documentation_style'].append("Inconsistent docstring quote style")
+            issue_count += 1
 
         # Calculate score
-        if not issues:
+        if not issue_count:
             return 100.0
             
-        score = max(0, 100 - (len(issues) * 10))
-        self.metrics['documentation_style'].extend(issues)
-        return score
+        return max(0, 100 - (issue_count * 10))
 
-    def _analyze_comment_ratio(self, code: str) -> float:
+    def _analyze_comment_ratio(self, code_lines: int, comment_lines: int) -> float:
         """
         Analyze the ratio of comments to code.
 
         Args:
-            code (str): Code to analyze
+            code_lines (int): Number of lines containing code
+            comment_lines (int): Number of lines containing a comment
 
         Returns:
             float: Comment ratio score (0-100)
         """
-        lines = code.splitlines()
-        code_lines = 0
-        comment_lines = 0
-        
-        for line in lines:
-            stripped = line.strip()
-            if stripped:
-                if stripped.startswith('#'):
-                    comment_lines += 1
-                elif '#' in line:
-                    code_lines += 1
-                    comment_lines += 1
-                else:
-                    code_lines += 1
-
         if code_lines == 0:
             return 100.0
 
@@ -308,24 +454,17 @@ class CodeCommentsAnalyzer(BaseAnalyzer):
         
         return score
 
-    def _calculate_overall_score(self, scores_and_weights: List[Tuple[float, float]]) -> float:
+    def _calculate_overall_score(self, scores: Tuple[float, ...]) -> float:
         """
         Calculate weighted average score.
 
         Args:
-            scores_and_weights: List of (score, weight) tuples
+            scores: Component scores, in the order of SCORE_WEIGHTS
 
         Returns:
             float: Weighted average score (0-100)
         """
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for score, weight in scores_and_weights:
-            total_score += score * weight
-            total_weight += weight
-            
-        return round(total_score / total_weight if total_weight > 0 else 0, 2)
+        return self._weighted_score(scores, self.SCORE_WEIGHTS)
 
     def _generate_findings(self) -> List[str]:
         """Generate list of significant findings."""
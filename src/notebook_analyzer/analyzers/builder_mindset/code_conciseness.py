@@ -10,9 +10,11 @@ Last Updated: 2025-02-17 23:49:18
 """
 
 import ast
-from typing import Dict, Any, List, Set, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from collections import defaultdict
 from ..base_analyzer import BaseAnalyzer, AnalysisError
+from ..analysis_context import AnalysisContext
+from ..node_visitor import CachedNodeVisitor
 
 
 class ConcisenessMeasures:
@@ -37,7 +39,7 @@ class ConcisenessMeasures:
     }
 
 
-class ConcisenessVisitor(ast.NodeVisitor):
+class ConcisenessVisitor(CachedNodeVisitor):
     """Visitor for analyzing code conciseness."""
 
     def __init__(self):
@@ -46,8 +48,12 @@ class ConcisenessVisitor(ast.NodeVisitor):
         self.issues = []
         self.suggestions = []
         self.current_nesting = 0
+        self.max_nesting = 0
         self.line_lengths = []
+        self.long_lines = 0
+        self.total_line_length = 0
         self.comprehensions = []
+        self.complex_comprehensions = 0
         self.repeated_patterns = defaultdict(int)
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
@@ -84,14 +90,20 @@ class ConcisenessVisitor(ast.NodeVisitor):
             )
         self.generic_visit(node)
 
+    def _enter_block(self) -> None:
+        """Increase the nesting depth and track its maximum."""
+        self.current_nesting += 1
+        if self.current_nesting > self.max_nesting:
+            self.max_nesting = self.current_nesting
+
     def visit_For(self, node: ast.For):
         """
-        Visit for loop nodes.
+        Visit for and while loop nodes.
 
         Args:
-            node (ast.For): The for loop node
+            node (ast.For): The loop node
         """
-        self.current_nesting += 1
+        self._enter_block()
         if self.current_nesting > ConcisenessMeasures.MAX_LOOP_NESTING:
             self.issues.append(
                 f"Deeply nested loop detected (depth: {self.current_nesting})"
@@ -102,6 +114,8 @@ class ConcisenessVisitor(ast.NodeVisitor):
         self.generic_visit(node)
         self.current_nesting -= 1
 
+    visit_AsyncFor = visit_While = visit_For
+
     def visit_If(self, node: ast.If):
         """
         Visit if statement nodes.
@@ -109,7 +123,7 @@ class ConcisenessVisitor(ast.NodeVisitor):
         Args:
             node (ast.If): The if statement node
         """
-        self.current_nesting += 1
+        self._enter_block()
         if self.current_nesting > ConcisenessMeasures.MAX_IF_NESTING:
             self.issues.append(
                 f"Deeply nested conditional detected (depth: {self.current_nesting})"
@@ -160,6 +174,7 @@ class ConcisenessVisitor(ast.NodeVisitor):
         """
         source_length = len(ast.dump(node))
         if source_length > ConcisenessMeasures.MAX_LIST_COMPREHENSION_LENGTH:
+            self.complex_comprehensions += 1
             self.issues.append(
                 f"Complex {comp_type} comprehension detected"
             )
@@ -176,19 +191,32 @@ class ConcisenessVisitor(ast.NodeVisitor):
         """
         Analyze line lengths in the code.
 
+        Long lines and the total length are counted in the same pass so the
+        scoring does not need to scan line_lengths again.
+
         Args:
             code (str): The code to analyze
         """
+        max_length = ConcisenessMeasures.MAX_LINE_LENGTH
+        line_lengths = self.line_lengths
+        long_lines = 0
+        total_length = 0
+
         for i, line in enumerate(code.splitlines(), 1):
             length = len(line)
-            if length > ConcisenessMeasures.MAX_LINE_LENGTH:
+            if length > max_length:
+                long_lines += 1
                 self.issues.append(
                     f"Line {i} is too long ({length} characters)"
                 )
                 self.suggestions.append(
                     f"Consider breaking line {i} into multiple lines"
                 )
-            self.line_lengths.append(length)
+            total_length += length
+            line_lengths.append(length)
+
+        self.long_lines += long_lines
+        self.total_line_length += total_length
 
 
 class CodeConcisenessAnalyzer(BaseAnalyzer):
@@ -219,16 +247,37 @@ class CodeConcisenessAnalyzer(BaseAnalyzer):
             'suggestions': []
         }
 
+    def _cache_config(self) -> Tuple[Any, ...]:
+        """
+        Get the analyzer settings that affect its results.
+
+        Returns:
+            Tuple[Any, ...]: Settings included in the cache key
+        """
+        return (
+            ConcisenessMeasures.MAX_LINE_LENGTH,
+            ConcisenessMeasures.MAX_FUNCTION_LENGTH,
+            ConcisenessMeasures.MAX_CLASS_LENGTH,
+            ConcisenessMeasures.MAX_LOOP_NESTING,
+            ConcisenessMeasures.MAX_IF_NESTING,
+            ConcisenessMeasures.MAX_LIST_COMPREHENSION_LENGTH,
+            tuple(ConcisenessMeasures.PATTERN_WEIGHTS.items())
+        )
+
     def get_metric_type(self) -> str:
         """Get the type of metric this analyzer produces."""
         return 'builder_mindset'
 
-    def analyze(self, code: str) -> Dict[str, Any]:
+    def analyze(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze code conciseness.
 
         Args:
             code (str): The code to analyze
+            context (Optional[AnalysisContext]): Parse results shared with
+                other analyzers of the same code
 
         Returns:
             Dict[str, Any]: Analysis results containing:
@@ -242,12 +291,19 @@ class CodeConcisenessAnalyzer(BaseAnalyzer):
             ValueError: If code is invalid
         """
         try:
-            self.prepare_analysis(code)
+            context = self.prepare_analysis(code, context)
+
+            cache_key = self._cache_key(code)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                self.metrics = cached['details']['metrics']
+                return cached
+
             self._reset_metrics()
 
             # Parse the code
             try:
-                tree = ast.parse(code)
+                tree = context.tree
             except SyntaxError as e:
                 raise AnalysisError(f"Syntax error in code: {str(e)}")
 
@@ -257,18 +313,23 @@ class CodeConcisenessAnalyzer(BaseAnalyzer):
             visitor.analyze_line_lengths(code)
 
             # Calculate component scores
-            line_score = self._calculate_line_score(visitor.line_lengths)
-            nesting_score = self._calculate_nesting_score(visitor.current_nesting)
-            comprehension_score = self._calculate_comprehension_score(visitor.comprehensions)
+            line_score = self._calculate_line_score(visitor.long_lines)
+            nesting_score = self._calculate_nesting_score(visitor.max_nesting)
+            comprehension_score = self._calculate_comprehension_score(
+                visitor.complex_comprehensions
+            )
             repetition_score = self._calculate_repetition_score(visitor.repeated_patterns)
 
             # Calculate overall score
-            overall_score = self._calculate_overall_score([
-                (line_score, ConcisenessMeasures.PATTERN_WEIGHTS['long_lines']),
-                (nesting_score, ConcisenessMeasures.PATTERN_WEIGHTS['nested_structures']),
-                (repetition_score, ConcisenessMeasures.PATTERN_WEIGHTS['repeated_code']),
-                (comprehension_score, ConcisenessMeasures.PATTERN_WEIGHTS['comprehension_usage'])
-            ])
+            overall_score = self._calculate_overall_score((
+                line_score, nesting_score, repetition_score, comprehension_score
+            ))
+
+            self.metrics = {
+                'line_lengths': visitor.line_lengths,
+                'comprehensions': visitor.comprehensions,
+                'repeated_patterns': dict(visitor.repeated_patterns)
+            }
 
             # Prepare results
             results = {
@@ -279,11 +340,7 @@ class CodeConcisenessAnalyzer(BaseAnalyzer):
                     'nesting_score': nesting_score,
                     'comprehension_score': comprehension_score,
                     'repetition_score': repetition_score,
-                    'metrics': {
-                        'line_lengths': visitor.line_lengths,
-                        'comprehensions': visitor.comprehensions,
-                        'repeated_patterns': dict(visitor.repeated_patterns)
-                    }
+                    'metrics': self.metrics
                 },
                 'suggestions': self._generate_suggestions(visitor)
             }
@@ -291,26 +348,25 @@ class CodeConcisenessAnalyzer(BaseAnalyzer):
             if not self.validate_results(results):
                 raise AnalysisError("Invalid analysis results generated")
 
+            self._store_cached_result(cache_key, results)
             return results
 
         except Exception as e:
             raise AnalysisError(f"Error analyzing code conciseness: {str(e)}")
 
-    def _calculate_line_score(self, line_lengths: List[int]) -> float:
+    def _calculate_line_score(self, long_lines: int) -> float:
         """
         Calculate score based on line lengths.
 
         Args:
-            line_lengths (List[int]): List of line lengths
+            long_lines (int): Number of lines longer than MAX_LINE_LENGTH
 
         Returns:
             float: Line length score (0-100)
         """
-        if not line_lengths:
+        if not long_lines:
             return 100.0
             
-        long_lines = sum(1 for length in line_lengths
-                        if length > ConcisenessMeasures.MAX_LINE_LENGTH)
         return max(0, 100 - (long_lines * 5))
 
     def _calculate_nesting_score(self, max_nesting: int) -> float:
@@ -327,23 +383,19 @@ class CodeConcisenessAnalyzer(BaseAnalyzer):
             return 100.0
         return max(0, 100 - ((max_nesting - ConcisenessMeasures.MAX_IF_NESTING) * 15))
 
-    def _calculate_comprehension_score(self, comprehensions: List[Dict[str, Any]]) -> float:
+    def _calculate_comprehension_score(self, complex_comprehensions: int) -> float:
         """
         Calculate score based on comprehension usage.
 
         Args:
-            comprehensions (List[Dict[str, Any]]): List of comprehension metrics
+            complex_comprehensions (int): Number of overly complex comprehensions
 
         Returns:
             float: Comprehension score (0-100)
         """
-        if not comprehensions:
+        if not complex_comprehensions:
             return 100.0
             
-        complex_comprehensions = sum(
-            1 for comp in comprehensions
-            if comp['length'] > ConcisenessMeasures.MAX_LIST_COMPREHENSION_LENGTH
-        )
         return max(0, 100 - (complex_comprehensions * 10))
 
     def _calculate_repetition_score(self, patterns: Dict[str, int]) -> float:
@@ -362,24 +414,17 @@ class CodeConcisenessAnalyzer(BaseAnalyzer):
         repetition_penalty = sum(count - 1 for count in patterns.values() if count > 1)
         return max(0, 100 - (repetition_penalty * 5))
 
-    def _calculate_overall_score(self, scores_and_weights: List[tuple[float, float]]) -> float:
+    def _calculate_overall_score(self, scores: Tuple[float, ...]) -> float:
         """
         Calculate weighted average score.
 
         Args:
-            scores_and_weights: List of (score, weight) tuples
+            scores: Component scores, in the order of PATTERN_WEIGHTS
 
         Returns:
             float: Weighted average score (0-100)
         """
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for score, weight in scores_and_weights:
-            total_score += score * weight
-            total_weight += weight
-            
-        return round(total_score / total_weight if total_weight > 0 else 0, 2)
+        return self._weighted_score(scores, ConcisenessMeasures.PATTERN_WEIGHTS.values())
 
     def _generate_suggestions(self, visitor: ConcisenessVisitor) -> List[str]:
         """
@@ -395,13 +440,13 @@ class CodeConcisenessAnalyzer(BaseAnalyzer):
 
         # Add general suggestions
         if visitor.line_lengths:
-            avg_length = sum(visitor.line_lengths) / len(visitor.line_lengths)
+            avg_length = visitor.total_line_length / len(visitor.line_lengths)
             if avg_length > ConcisenessMeasures.MAX_LINE_LENGTH * 0.8:
                 suggestions.append(
                     "Consider using shorter, more focused lines of code"
                 )
 
-        if visitor.current_nesting > ConcisenessMeasures.MAX_IF_NESTING - 1:
+        if visitor.max_nesting > ConcisenessMeasures.MAX_IF_NESTING - 1:
             suggestions.append(
                 "Consider extracting nested logic into separate functions"
             )
@@ -415,7 +460,7 @@ class CodeConcisenessAnalyzer(BaseAnalyzer):
 
     def __str__(self) -> str:
         """Return string representation of the analyzer."""
-        return f"Code Conciseness Analyzer"
+        return "Code Conciseness Analyzer"
 
     def __repr__(self) -> str:
         """Return detailed string representation of the analyzer."""
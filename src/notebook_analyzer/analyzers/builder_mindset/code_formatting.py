@@ -9,11 +9,16 @@ Date: 2025-02-17
 """
 
 import ast
-from typing import Dict, Any, List, Tuple
+from collections import deque
+from typing import Dict, Any, List, Tuple, Optional
 import re
 from ..base_analyzer import BaseAnalyzer, AnalysisError
+from ..analysis_context import AnalysisContext
 import autopep8
 import black
+import pycodestyle
+
+_IMPORT_NODES = frozenset({ast.Import, ast.ImportFrom})
 
 class CodeFormattingAnalyzer(BaseAnalyzer):
     """
@@ -31,6 +36,8 @@ class CodeFormattingAnalyzer(BaseAnalyzer):
         MAX_LINE_LENGTH (int): Maximum recommended line length
         INDENT_SIZE (int): Standard indentation size in spaces
         NAME_PATTERNS (Dict[str, str]): Regex patterns for naming conventions
+        SCORE_WEIGHTS (Tuple[float, ...]): Weights of the style, indentation,
+            naming, import organization and whitespace scores
     """
 
     MAX_LINE_LENGTH = 79  # PEP 8 recommended
@@ -41,6 +48,7 @@ class CodeFormattingAnalyzer(BaseAnalyzer):
         'class': r'^[A-Z][a-zA-Z0-9]*$',
         'function': r'^[a-z_][a-z0-9_]*$'
     }
+    SCORE_WEIGHTS = (0.3, 0.25, 0.2, 0.15, 0.1)
 
     def __init__(self):
         """Initialize the code formatting analyzer."""
@@ -59,16 +67,36 @@ class CodeFormattingAnalyzer(BaseAnalyzer):
             'whitespace_issues': []
         }
 
+    def _cache_config(self) -> Tuple[Any, ...]:
+        """
+        Get the analyzer settings that affect its results.
+
+        Returns:
+            Tuple[Any, ...]: Settings included in the cache key
+        """
+        return (
+            self.MAX_LINE_LENGTH,
+            self.INDENT_SIZE,
+            tuple(self.NAME_PATTERNS.items()),
+            self.SCORE_WEIGHTS,
+            autopep8.__version__,
+            pycodestyle.__version__
+        )
+
     def get_metric_type(self) -> str:
         """Get the type of metric this analyzer produces."""
         return 'builder_mindset'
 
-    def analyze(self, code: str) -> Dict[str, Any]:
+    def analyze(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze code formatting and style.
 
         Args:
             code (str): The code to analyze
+            context (Optional[AnalysisContext]): Parse results shared with
+                other analyzers of the same code
 
         Returns:
             Dict[str, Any]: Analysis results containing:
@@ -82,30 +110,34 @@ class CodeFormattingAnalyzer(BaseAnalyzer):
             ValueError: If code is invalid
         """
         try:
-            self.prepare_analysis(code)
+            context = self.prepare_analysis(code, context)
+
+            cache_key = self._cache_key(code)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                self.metrics = cached['details']['metrics']
+                return cached
+
             self._reset_metrics()
 
             # Parse the code
             try:
-                tree = ast.parse(code)
+                tree = context.tree
             except SyntaxError as e:
                 raise AnalysisError(f"Syntax error in code: {str(e)}")
 
+            lines = code.splitlines()
+
             # Perform various formatting checks
-            style_score = self._check_pep8_compliance(code)
-            indent_score = self._check_indentation(code)
+            style_score = self._check_pep8_compliance(code, lines)
+            indent_score, whitespace_score = self._check_lines(lines)
             naming_score = self._check_naming_conventions(tree)
             import_score = self._check_import_organization(tree)
-            whitespace_score = self._check_whitespace(code)
 
             # Calculate overall score
-            overall_score = self._calculate_overall_score([
-                (style_score, 0.3),    # 30% weight
-                (indent_score, 0.25),   # 25% weight
-                (naming_score, 0.2),    # 20% weight
-                (import_score, 0.15),   # 15% weight
-                (whitespace_score, 0.1) # 10% weight
-            ])
+            overall_score = self._calculate_overall_score((
+                style_score, indent_score, naming_score, import_score, whitespace_score
+            ))
 
             # Prepare results
             results = {
@@ -125,17 +157,19 @@ class CodeFormattingAnalyzer(BaseAnalyzer):
             if not self.validate_results(results):
                 raise AnalysisError("Invalid analysis results generated")
 
+            self._store_cached_result(cache_key, results)
             return results
 
         except Exception as e:
             raise AnalysisError(f"Error analyzing code formatting: {str(e)}")
 
-    def _check_pep8_compliance(self, code: str) -> float:
+    def _check_pep8_compliance(self, code: str, lines: List[str]) -> float:
         """
         Check code compliance with PEP 8 style guide.
 
         Args:
             code (str): Code to check
+            lines (List[str]): Lines of the code
 
         Returns:
             float: Style compliance score (0-100)
@@ -143,7 +177,7 @@ class CodeFormattingAnalyzer(BaseAnalyzer):
         try:
             # Use autopep8 to identify style issues
             fixed_code = autopep8.fix_code(code, options={'aggressive': 1})
-            diff_lines = len(fixed_code.splitlines()) - len(code.splitlines())
+            diff_lines = len(fixed_code.splitlines()) - len(lines)
             
             # Calculate style score based on number of fixes needed
             if diff_lines == 0:
@@ -164,33 +198,54 @@ class CodeFormattingAnalyzer(BaseAnalyzer):
             self.metrics['style_violations'].append(f"Style check error: {str(e)}")
             return 50.0  # Default to middle score on error
 
-    def _check_indentation(self, code: str) -> float:
+    def _check_lines(self, lines: List[str]) -> Tuple[float, float]:
         """
-        Check code indentation consistency.
+        Check indentation consistency, whitespace usage and line length.
+
+        All three are per-line checks, so they share a single pass over the lines.
 
         Args:
-            code (str): Code to check
+            lines (List[str]): Lines of the code to check
 
         Returns:
-            float: Indentation consistency score (0-100)
+            Tuple[float, float]: Indentation and whitespace scores (0-100)
         """
-        lines = code.splitlines()
-        issues = []
+        indent_issues = []
+        whitespace_issues = []
         
         for i, line in enumerate(lines, 1):
-            if line.strip():  # Skip empty lines
+            content = line.lstrip()
+            if content:  # Skip empty lines
                 # Check if indentation is multiple of INDENT_SIZE
-                indent_level = len(line) - len(line.lstrip())
+                indent_level = len(line) - len(content)
                 if indent_level % self.INDENT_SIZE != 0:
-                    issues.append(f"Line {i}: Invalid indentation level")
+                    indent_issues.append(f"Line {i}: Invalid indentation level")
 
-        # Calculate score based on number of issues
-        if not issues:
-            return 100.0
-            
-        score = max(0, 100 - (len(issues) * 10))
-        self.metrics['indentation_issues'].extend(issues)
-        return score
+            rstripped = line.rstrip()
+
+            # Check trailing whitespace
+            if len(rstripped) != len(line):
+                whitespace_issues.append(f"Line {i}: Trailing whitespace")
+                
+            # Check multiple spaces between tokens
+            if '  ' in content.rstrip():
+                whitespace_issues.append(f"Line {i}: Multiple spaces used")
+                
+            # Check line length
+            if len(line) > self.MAX_LINE_LENGTH:
+                self.metrics['line_lengths'].append(
+                    f"Line {i}: Length {len(line)} exceeds {self.MAX_LINE_LENGTH}"
+                )
+
+        # Calculate scores based on number of issues
+        self.metrics['indentation_issues'].extend(indent_issues)
+        self.metrics['whitespace_issues'].extend(whitespace_issues)
+        indent_score = max(0, 100 - (len(indent_issues) * 10)) if indent_issues else 100.0
+        whitespace_score = (
+            max(0, 100 - (len(whitespace_issues) * 5)) if whitespace_issues else 100.0
+        )
+
+        return indent_score, whitespace_score
 
     def _check_naming_conventions(self, tree: ast.AST) -> float:
         """
@@ -203,21 +258,23 @@ class CodeFormattingAnalyzer(BaseAnalyzer):
             float: Naming convention compliance score (0-100)
         """
         issues = []
-        
+        # Compile the patterns once per check instead of per name
+        patterns = {kind: re.compile(pattern) for kind, pattern in self.NAME_PATTERNS.items()}
+
         for node in ast.walk(tree):
             if isinstance(node, ast.ClassDef):
-                if not re.match(self.NAME_PATTERNS['class'], node.name):
+                if not patterns['class'].match(node.name):
                     issues.append(f"Class name '{node.name}' doesn't follow conventions")
                     
             elif isinstance(node, ast.FunctionDef):
-                if not re.match(self.NAME_PATTERNS['function'], node.name):
+                if not patterns['function'].match(node.name):
                     issues.append(f"Function name '{node.name}' doesn't follow conventions")
                     
             elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
                 # Check variables and constants
-                if node.id.isupper() and not re.match(self.NAME_PATTERNS['constant'], node.id):
+                if node.id.isupper() and not patterns['constant'].match(node.id):
                     issues.append(f"Constant name '{node.id}' doesn't follow conventions")
-                elif not node.id.isupper() and not re.match(self.NAME_PATTERNS['variable'], node.id):
+                elif not node.id.isupper() and not patterns['variable'].match(node.id):
                     issues.append(f"Variable name '{node.id}' doesn't follow conventions")
 
         # Calculate score based on number of issues
@@ -241,9 +298,17 @@ class CodeFormattingAnalyzer(BaseAnalyzer):
         issues = []
         import_nodes = []
         
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
+        # Breadth-first like ast.walk, but imports are statements and
+        # expressions never contain statements, so expressions are skipped
+        pending = deque([tree])
+        while pending:
+            node = pending.popleft()
+            if type(node) in _IMPORT_NODES:
                 import_nodes.append(node)
+            pending.extend(
+                child for child in ast.iter_child_nodes(node)
+                if not isinstance(child, ast.expr)
+            )
 
         if not import_nodes:
             return 100.0
@@ -264,60 +329,17 @@ class CodeFormattingAnalyzer(BaseAnalyzer):
         self.metrics['import_organization'].extend(issues)
         return score
 
-    def _check_whitespace(self, code: str) -> float:
-        """
-        Check whitespace usage in code.
-
-        Args:
-            code (str): Code to check
-
-        Returns:
-            float: Whitespace usage score (0-100)
-        """
-        issues = []
-        lines = code.splitlines()
-        
-        for i, line in enumerate(lines, 1):
-            # Check trailing whitespace
-            if line.rstrip() != line:
-                issues.append(f"Line {i}: Trailing whitespace")
-                
-            # Check multiple spaces between tokens
-            if '  ' in line.strip():
-                issues.append(f"Line {i}: Multiple spaces used")
-                
-            # Check line length
-            if len(line) > self.MAX_LINE_LENGTH:
-                self.metrics['line_lengths'].append(
-                    f"Line {i}: Length {len(line)} exceeds {self.MAX_LINE_LENGTH}"
-                )
-
-        # Calculate score
-        if not issues:
-            return 100.0
-            
-        score = max(0, 100 - (len(issues) * 5))
-        self.metrics['whitespace_issues'].extend(issues)
-        return score
-
-    def _calculate_overall_score(self, scores_and_weights: List[Tuple[float, float]]) -> float:
+    def _calculate_overall_score(self, scores: Tuple[float, ...]) -> float:
         """
         Calculate weighted average score.
 
         Args:
-            scores_and_weights: List of (score, weight) tuples
+            scores: Component scores, in the order of SCORE_WEIGHTS
 
         Returns:
             float: Weighted average score (0-100)
         """
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for score, weight in scores_and_weights:
-            total_score += score * weight
-            total_weight += weight
-            
-        return round(total_score / total_weight if total_weight > 0 else 0, 2)
+        return self._weighted_score(scores, self.SCORE_WEIGHTS)
 
     def _generate_findings(self) -> List[str]:
         """Generate list of significant findings."""
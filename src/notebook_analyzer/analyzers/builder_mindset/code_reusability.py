@@ -10,9 +10,11 @@ Last Updated: 2025-02-17 23:51:34
 """
 
 import ast
-from typing import Dict, Any, List, Set, Optional
+from typing import Dict, Any, List, Set, Tuple, Optional
 from collections import defaultdict
 from ..base_analyzer import BaseAnalyzer, AnalysisError
+from ..analysis_context import AnalysisContext
+from ..node_visitor import CachedNodeVisitor
 
 
 class ReusabilityMetrics:
@@ -41,7 +43,14 @@ class ReusabilityMetrics:
     }
 
 
-class ReusabilityVisitor(ast.NodeVisitor):
+# Required docstring sections with their lowercase spelling, built once at import
+_DOCSTRING_SECTIONS = tuple(
+    (section, section.lower())
+    for section in sorted(ReusabilityMetrics.REQUIRED_DOCSTRING_SECTIONS)
+)
+
+
+class ReusabilityVisitor(CachedNodeVisitor):
     """Visitor for analyzing code reusability."""
 
     def __init__(self):
@@ -52,6 +61,7 @@ class ReusabilityVisitor(ast.NodeVisitor):
         self.suggestions = []
         self.metrics = defaultdict(list)
         self.dependencies = defaultdict(set)
+        self._scope_dependencies = []
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
         """
@@ -94,11 +104,10 @@ class ReusabilityVisitor(ast.NodeVisitor):
         # Check docstring
         self._analyze_docstring(node, function_info['docstring'], 'function')
         
-        # Analyze function body for dependencies
-        self._analyze_dependencies(node, function_info['dependencies'])
-        
         self.functions.append(function_info)
-        self.generic_visit(node)
+
+        # Visit function body, collecting its dependencies
+        self._visit_scope(node, function_info['dependencies'])
 
     def visit_ClassDef(self, node: ast.ClassDef):
         """
@@ -152,11 +161,20 @@ class ReusabilityVisitor(ast.NodeVisitor):
         # Check docstring
         self._analyze_docstring(node, class_info['docstring'], 'class')
         
-        # Analyze class dependencies
-        self._analyze_dependencies(node, class_info['dependencies'])
-        
         self.classes.append(class_info)
-        self.generic_visit(node)
+
+        # Visit class body, collecting its dependencies
+        self._visit_scope(node, class_info['dependencies'])
+
+    def visit_Name(self, node: ast.Name):
+        """
+        Visit name nodes, recording loaded names as dependencies.
+
+        Args:
+            node (ast.Name): The name node
+        """
+        if self._scope_dependencies and isinstance(node.ctx, ast.Load):
+            self._scope_dependencies[-1].add(node.id)
 
     def _analyze_docstring(self, node: ast.AST, docstring: Optional[str], node_type: str):
         """
@@ -182,28 +200,32 @@ class ReusabilityVisitor(ast.NodeVisitor):
             )
             
         # Check for required sections
-        sections_found = {
-            section for section in ReusabilityMetrics.REQUIRED_DOCSTRING_SECTIONS
-            if section.lower() in docstring.lower()
-        }
-        
-        missing_sections = ReusabilityMetrics.REQUIRED_DOCSTRING_SECTIONS - sections_found
+        lowered = docstring.lower()
+        missing_sections = [
+            section for section, section_lower in _DOCSTRING_SECTIONS
+            if section_lower not in lowered
+        ]
         if missing_sections:
             self.suggestions.append(
                 f"Add {', '.join(missing_sections)} sections to {node_type} '{node.name}' docstring"
             )
 
-    def _analyze_dependencies(self, node: ast.AST, dependencies: Set[str]):
+    def _visit_scope(self, node: ast.AST, dependencies: Set[str]):
         """
-        Analyze node dependencies.
+        Visit a function or class subtree, collecting the names it loads.
+
+        Names loaded in nested definitions also count as dependencies of the
+        enclosing ones, so each subtree is walked only once.
 
         Args:
-            node (ast.AST): The AST node
+            node (ast.AST): The function or class node
             dependencies (Set[str]): Set to store dependencies
         """
-        for child in ast.walk(node):
-            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
-                dependencies.add(child.id)
+        self._scope_dependencies.append(dependencies)
+        self.generic_visit(node)
+        self._scope_dependencies.pop()
+        if self._scope_dependencies:
+            self._scope_dependencies[-1] |= dependencies
 
 
 class CodeReusabilityAnalyzer(BaseAnalyzer):
@@ -232,16 +254,39 @@ class CodeReusabilityAnalyzer(BaseAnalyzer):
             'modularity_metrics': []
         }
 
+    def _cache_config(self) -> Tuple[Any, ...]:
+        """
+        Get the analyzer settings that affect its results.
+
+        Returns:
+            Tuple[Any, ...]: Settings included in the cache key
+        """
+        return (
+            ReusabilityMetrics.MAX_FUNCTION_PARAMS,
+            ReusabilityMetrics.MIN_FUNCTION_LENGTH,
+            ReusabilityMetrics.MAX_FUNCTION_LENGTH,
+            ReusabilityMetrics.MAX_CLASS_METHODS,
+            ReusabilityMetrics.MIN_CLASS_METHODS,
+            ReusabilityMetrics.MAX_CLASS_ATTRIBUTES,
+            ReusabilityMetrics.MIN_DOCSTRING_LENGTH,
+            tuple(sorted(ReusabilityMetrics.REQUIRED_DOCSTRING_SECTIONS)),
+            tuple(ReusabilityMetrics.PATTERN_WEIGHTS.items())
+        )
+
     def get_metric_type(self) -> str:
         """Get the type of metric this analyzer produces."""
         return 'builder_mindset'
 
-    def analyze(self, code: str) -> Dict[str, Any]:
+    def analyze(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze code reusability.
 
         Args:
             code (str): The code to analyze
+            context (Optional[AnalysisContext]): Parse results shared with
+                other analyzers of the same code
 
         Returns:
             Dict[str, Any]: Analysis results containing:
@@ -255,12 +300,19 @@ class CodeReusabilityAnalyzer(BaseAnalyzer):
             ValueError: If code is invalid
         """
         try:
-            self.prepare_analysis(code)
+            context = self.prepare_analysis(code, context)
+
+            cache_key = self._cache_key(code)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                self.metrics = cached['details']['metrics']
+                return cached
+
             self._reset_metrics()
 
             # Parse the code
             try:
-                tree = ast.parse(code)
+                tree = context.tree
             except SyntaxError as e:
                 raise AnalysisError(f"Syntax error in code: {str(e)}")
 
@@ -275,12 +327,15 @@ class CodeReusabilityAnalyzer(BaseAnalyzer):
             modularity_score = self._calculate_modularity_score(visitor)
 
             # Calculate overall score
-            overall_score = self._calculate_overall_score([
-                (function_score, ReusabilityMetrics.PATTERN_WEIGHTS['function_design']),
-                (class_score, ReusabilityMetrics.PATTERN_WEIGHTS['class_design']),
-                (doc_score, ReusabilityMetrics.PATTERN_WEIGHTS['documentation']),
-                (modularity_score, ReusabilityMetrics.PATTERN_WEIGHTS['modularity'])
-            ])
+            overall_score = self._calculate_overall_score((
+                function_score, class_score, doc_score, modularity_score
+            ))
+
+            self.metrics = {
+                'functions': visitor.functions,
+                'classes': visitor.classes,
+                'dependencies': dict(visitor.dependencies)
+            }
 
             # Prepare results
             results = {
@@ -291,11 +346,7 @@ class CodeReusabilityAnalyzer(BaseAnalyzer):
                     'class_score': class_score,
                     'documentation_score': doc_score,
                     'modularity_score': modularity_score,
-                    'metrics': {
-                        'functions': visitor.functions,
-                        'classes': visitor.classes,
-                        'dependencies': dict(visitor.dependencies)
-                    }
+                    'metrics': self.metrics
                 },
                 'suggestions': self._generate_suggestions(visitor)
             }
@@ -303,6 +354,7 @@ class CodeReusabilityAnalyzer(BaseAnalyzer):
             if not self.validate_results(results):
                 raise AnalysisError("Invalid analysis results generated")
 
+            self._store_cached_result(cache_key, results)
             return results
 
         except Exception as e:
@@ -389,24 +441,17 @@ class CodeReusabilityAnalyzer(BaseAnalyzer):
                 
         return max(0, 100 - (dependency_issues * 10))
 
-    def _calculate_overall_score(self, scores_and_weights: List[tuple[float, float]]) -> float:
+    def _calculate_overall_score(self, scores: Tuple[float, ...]) -> float:
         """
         Calculate weighted average score.
 
         Args:
-            scores_and_weights: List of (score, weight) tuples
+            scores: Component scores, in the order of PATTERN_WEIGHTS
 
         Returns:
             float: Weighted average score (0-100)
         """
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for score, weight in scores_and_weights:
-            total_score += score * weight
-            total_weight += weight
-            
-        return round(total_score / total_weight if total_weight > 0 else 0, 2)
+        return self._weighted_score(scores, ReusabilityMetrics.PATTERN_WEIGHTS.values())
 
     def _generate_suggestions(self, visitor: ReusabilityVisitor) -> List[str]:
         """
@@ -441,7 +486,7 @@ class CodeReusabilityAnalyzer(BaseAnalyzer):
 
     def __str__(self) -> str:
         """Return string representation of the analyzer."""
-        return f"Code Reusability Analyzer"
+        return "Code Reusability Analyzer"
 
     def __repr__(self) -> str:
         """Return detailed string representation of the analyzer."""
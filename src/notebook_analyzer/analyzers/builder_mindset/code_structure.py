@@ -10,12 +10,39 @@ Last Updated: 2025-02-17 23:39:04
 """
 
 import ast
-from typing import Dict, Any, List, Tuple, Set, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from collections import defaultdict
 from ..base_analyzer import BaseAnalyzer, AnalysisError
+from ..analysis_context import AnalysisContext
+from ..node_visitor import CachedNodeVisitor
 
 
-class ParentNodeVisitor(ast.NodeVisitor):
+def _contains_return(node: ast.AST) -> bool:
+    """
+    Check whether a node contains a return statement.
+
+    Return is a statement and expressions never contain statements, so
+    expression subtrees are not descended into.
+
+    Args:
+        node (ast.AST): The node to search
+
+    Returns:
+        bool: True if a return statement is found
+    """
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        if type(current) is ast.Return:
+            return True
+        pending.extend(
+            child for child in ast.iter_child_nodes(current)
+            if not isinstance(child, ast.expr)
+        )
+    return False
+
+
+class ParentNodeVisitor(CachedNodeVisitor):
     """Base visitor that tracks parent nodes."""
     
     def visit(self, node):
@@ -104,8 +131,7 @@ class FunctionVisitor(ParentNodeVisitor):
             )
         
         # Check return statement presence
-        returns = [n for n in ast.walk(node) if isinstance(n, ast.Return)]
-        if not returns and not node.name.startswith('__'):
+        if not _contains_return(node) and not node.name.startswith('__'):
             self.issues.append(
                 f"Function '{node.name}' lacks explicit return statement"
             )
@@ -140,6 +166,12 @@ class ImportVisitor(ParentNodeVisitor):
         self.import_lines.append(node.lineno)
         self.generic_visit(node)
 
+    def generic_visit(self, node: ast.AST):
+        """Visit child statements only; expressions cannot hold imports."""
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, ast.expr):
+                self.visit(child)
+
 
 class ScopeVisitor(ParentNodeVisitor):
     """Visitor for analyzing scope usage."""
@@ -200,9 +232,8 @@ class DependencyVisitor(ParentNodeVisitor):
             node (ast.FunctionDef): The function definition node to visit
         """
         # Track function dependencies
-        calls = [n for n in ast.walk(node) if isinstance(n, ast.Call)]
-        for call in calls:
-            if isinstance(call.func, ast.Name):
+        for call in ast.walk(node):
+            if type(call) is ast.Call and type(call.func) is ast.Name:
                 self.dependency_graph[node.name].add(call.func.id)
         self.generic_visit(node)
 
@@ -223,11 +254,14 @@ class CodeStructureAnalyzer(BaseAnalyzer):
         MAX_CLASS_METHODS (int): Maximum recommended methods per class
         MAX_METHOD_PARAMS (int): Maximum recommended parameters per method
         MIN_CLASS_METHODS (int): Minimum recommended methods for a class
+        SCORE_WEIGHTS (Tuple[float, ...]): Weights of the class structure, function
+            organization, import structure, scope usage and dependency scores
     """
 
     MAX_CLASS_METHODS = 10
     MAX_METHOD_PARAMS = 5
     MIN_CLASS_METHODS = 2
+    SCORE_WEIGHTS = (0.30, 0.25, 0.20, 0.15, 0.10)
 
     def __init__(self):
         """Initialize the code structure analyzer."""
@@ -251,12 +285,16 @@ class CodeStructureAnalyzer(BaseAnalyzer):
         """Get the type of metric this analyzer produces."""
         return 'builder_mindset'
 
-    def analyze(self, code: str) -> Dict[str, Any]:
+    def analyze(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze code structure and organization.
 
         Args:
             code (str): The code to analyze
+            context (Optional[AnalysisContext]): Parse results shared with
+                other analyzers of the same code
 
         Returns:
             Dict[str, Any]: Analysis results containing:
@@ -270,12 +308,12 @@ class CodeStructureAnalyzer(BaseAnalyzer):
             ValueError: If code is invalid
         """
         try:
-            self.prepare_analysis(code)
+            context = self.prepare_analysis(code, context)
             self._reset_metrics()
 
             # Parse the code
             try:
-                tree = ast.parse(code)
+                tree = context.tree
             except SyntaxError as e:
                 raise AnalysisError(f"Syntax error in code: {str(e)}")
 
@@ -287,13 +325,9 @@ class CodeStructureAnalyzer(BaseAnalyzer):
             dependency_score = self._analyze_dependencies(tree)
 
             # Calculate overall score
-            overall_score = self._calculate_overall_score([
-                (class_score, 0.30),      # 30% weight
-                (function_score, 0.25),   # 25% weight
-                (import_score, 0.20),     # 20% weight
-                (scope_score, 0.15),      # 15% weight
-                (dependency_score, 0.10)  # 10% weight
-            ])
+            overall_score = self._calculate_overall_score((
+                class_score, function_score, import_score, scope_score, dependency_score
+            ))
 
             # Prepare results
             results = {
@@ -445,24 +479,17 @@ class CodeStructureAnalyzer(BaseAnalyzer):
         self.metrics['dependencies'].extend(issues)
         return score
 
-    def _calculate_overall_score(self, scores_and_weights: List[Tuple[float, float]]) -> float:
+    def _calculate_overall_score(self, scores: Tuple[float, ...]) -> float:
         """
         Calculate weighted average score.
 
         Args:
-            scores_and_weights: List of (score, weight) tuples
+            scores: Component scores, in the order of SCORE_WEIGHTS
 
         Returns:
             float: Weighted average score (0-100)
         """
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for score, weight in scores_and_weights:
-            total_score += score * weight
-            total_weight += weight
-            
-        return round(total_score / total_weight if total_weight > 0 else 0, 2)
+        return self._weighted_score(scores, self.SCORE_WEIGHTS)
 
     def _generate_findings(self) -> List[str]:
         """
@@ -10,21 +10,27 @@ Last Updated: 2025-02-17 23:45:59
 """
 
 import ast
-from typing import Dict, Any, List, Set, Optional
-from collections import defaultdict
+from typing import Dict, Any, List, Optional
+from collections import Counter
 from ..base_analyzer import BaseAnalyzer, AnalysisError
+from ..analysis_context import AnalysisContext
+from ..node_visitor import CachedNodeVisitor
 
 
-class JoinVisitor(ast.NodeVisitor):
+class JoinVisitor(CachedNodeVisitor):
     """Visitor for analyzing join operations."""
 
-    PANDAS_JOIN_METHODS = {
+    PANDAS_JOIN_METHODS = frozenset({
         'merge', 'join', 'concat', 'append'
-    }
+    })
 
-    PANDAS_ALIASES = {
+    PANDAS_ALIASES = frozenset({
         'pandas', 'pd'
-    }
+    })
+
+    MERGE_KEY_ARGS = frozenset({
+        'on', 'left_on', 'right_on'
+    })
 
     JOIN_TYPE_WEIGHTS = {
         'inner': 1.0,
@@ -41,6 +47,8 @@ class JoinVisitor(ast.NodeVisitor):
         self.issues = []
         self.suggestions = []
         self.join_count = 0
+        self.join_methods = Counter()
+        self.join_types = Counter()
 
     def visit_Import(self, node: ast.Import):
         """
@@ -89,6 +97,9 @@ class JoinVisitor(ast.NodeVisitor):
                 
                 self._analyze_join_operation(join_info, node)
                 self.join_operations.append(join_info)
+                self.join_methods[method_name] += 1
+                if method_name == 'merge':
+                    self.join_types[join_info['kwargs'].get('how', 'inner')] += 1
                 
         self.generic_visit(node)
 
@@ -136,41 +147,69 @@ class JoinVisitor(ast.NodeVisitor):
             join_info (Dict[str, Any]): Information about the join
             node (ast.Call): The join operation node
         """
-        method = join_info['method']
-        kwargs = join_info['kwargs']
-        line_no = join_info['line_no']
-
-        if method == 'merge':
-            # Check join type
-            join_type = kwargs.get('how', 'inner')
-            if join_type == 'cross':
-                self.issues.append(
-                    f"Line {line_no}: Cross join detected - consider using a more specific join type"
-                )
-
-            # Check join keys
-            if not any(key in kwargs for key in ['on', 'left_on', 'right_on']):
-                self.issues.append(
-                    f"Line {line_no}: Join columns not explicitly specified"
-                )
-
-            # Check for sorted data with multiple keys
-            if self._has_multiple_keys(kwargs) and not kwargs.get('sort', False):
-                self.suggestions.append(
-                    f"Line {line_no}: Consider sorting data before joining on multiple keys"
-                )
-
-        elif method == 'concat':
-            if 'axis' not in kwargs:
-                self.suggestions.append(
-                    f"Line {line_no}: Consider specifying 'axis' parameter in concat operation"
-                )
-
-        elif method == 'append':
+        check = self._JOIN_CHECKS.get(join_info['method'])
+        if check is not None:
+            check(self, join_info['kwargs'], join_info['line_no'])
+
+    def _check_merge(self, kwargs: Dict[str, Any], line_no: int):
+        """
+        Check a merge operation for potential issues.
+
+        Args:
+            kwargs (Dict[str, Any]): Join operation keyword arguments
+            line_no (int): Line number of the operation
+        """
+        # Check join type
+        join_type = kwargs.get('how', 'inner')
+        if join_type == 'cross':
+            self.issues.append(
+                f"Line {line_no}: Cross join detected - consider using a more specific join type"
+            )
+
+        # Check join keys
+        if self.MERGE_KEY_ARGS.isdisjoint(kwargs):
+            self.issues.append(
+                f"Line {line_no}: Join columns not explicitly specified"
+            )
+
+        # Check for sorted data with multiple keys
+        if self._has_multiple_keys(kwargs) and not kwargs.get('sort', False):
             self.suggestions.append(
-                f"Line {line_no}: 'append' is deprecated, consider using 'concat' instead"
+                f"Line {line_no}: Consider sorting data before joining on multiple keys"
             )
 
+    def _check_concat(self, kwargs: Dict[str, Any], line_no: int):
+        """
+        Check a concat operation for potential issues.
+
+        Args:
+            kwargs (Dict[str, Any]): Join operation keyword arguments
+            line_no (int): Line number of the operation
+        """
+        if 'axis' not in kwargs:
+            self.suggestions.append(
+                f"Line {line_no}: Consider specifying 'axis' parameter in concat operation"
+            )
+
+    def _check_append(self, kwargs: Dict[str, Any], line_no: int):
+        """
+        Check an append operation for potential issues.
+
+        Args:
+            kwargs (Dict[str, Any]): Join operation keyword arguments
+            line_no (int): Line number of the operation
+        """
+        self.suggestions.append(
+            f"Line {line_no}: 'append' is deprecated, consider using 'concat' instead"
+        )
+
+    # Method-specific checks, looked up by method name
+    _JOIN_CHECKS = {
+        'merge': _check_merge,
+        'concat': _check_concat,
+        'append': _check_append
+    }
+
     def _has_multiple_keys(self, kwargs: Dict[str, Any]) -> bool:
         """
         Check if join uses multiple keys.
@@ -217,20 +256,24 @@ class DatasetJoinAnalyzer(BaseAnalyzer):
             'join_operations': [],
             'issues': [],
             'suggestions': [],
-            'join_types': defaultdict(int),
-            'join_methods': defaultdict(int)
+            'join_types': Counter(),
+            'join_methods': Counter()
         }
 
     def get_metric_type(self) -> str:
         """Get the type of metric this analyzer produces."""
         return 'builder_mindset'
 
-    def analyze(self, code: str) -> Dict[str, Any]:
+    def analyze(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze dataset join operations.
 
         Args:
             code (str): The code to analyze
+            context (Optional[AnalysisContext]): Parse results shared with
+                other analyzers of the same code
 
         Returns:
             Dict[str, Any]: Analysis results containing:
@@ -244,32 +287,29 @@ class DatasetJoinAnalyzer(BaseAnalyzer):
             ValueError: If code is invalid
         """
         try:
-            self.prepare_analysis(code)
+            context = self.prepare_analysis(code, context)
             self._reset_metrics()
 
             # Parse the code
             try:
-                tree = ast.parse(code)
+                tree = context.tree
             except SyntaxError as e:
                 raise AnalysisError(f"Syntax error in code: {str(e)}")
 
-            # Analyze join patterns
+            # Analyze join patterns; code that never names a join method
+            # has no join calls, so its tree is not walked
             visitor = JoinVisitor()
-            visitor.visit(tree)
+            if self._may_mention(code, JoinVisitor.PANDAS_JOIN_METHODS):
+                visitor.visit(tree)
 
             # Process results
             join_count = visitor.join_count
             self.metrics['issues'] = visitor.issues
             self.metrics['suggestions'] = visitor.suggestions
 
-            # Analyze join operations
-            for join_op in visitor.join_operations:
-                method = join_op['method']
-                self.metrics['join_methods'][method] += 1
-
-                if method == 'merge':
-                    join_type = join_op['kwargs'].get('how', 'inner')
-                    self.metrics['join_types'][join_type] += 1
+            # Join methods and types are tallied during the visit
+            self.metrics['join_methods'] = visitor.join_methods
+            self.metrics['join_types'] = visitor.join_types
 
             # Calculate score
             score = self._calculate_score(visitor)
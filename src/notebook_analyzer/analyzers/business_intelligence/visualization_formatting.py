@@ -10,9 +10,11 @@ Last Updated: 2025-02-17 23:59:44
 """
 
 import ast
-from typing import Dict, Any, List, Set, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from collections import defaultdict
 from ..base_analyzer import BaseAnalyzer, AnalysisError
+from ..analysis_context import AnalysisContext
+from ..node_visitor import CachedNodeVisitor
 
 
 class FormattingFeatures:
@@ -43,6 +45,11 @@ class FormattingFeatures:
         'grid': {'grid'},
         'theme': {'style', 'set_style', 'set_theme'}
     }
+
+    # Methods that change the global plot style
+    STYLE_METHODS = frozenset({
+        'set_style', 'style', 'set_context', 'set_palette'
+    })
     
     # Pattern weights for scoring
     PATTERN_WEIGHTS = {
@@ -53,7 +60,15 @@ class FormattingFeatures:
     }
 
 
-class FormattingVisitor(ast.NodeVisitor):
+# Every method name any formatting check reacts to, built once at import
+_FORMATTING_METHODS = frozenset({'figure'}).union(
+    FormattingFeatures.STYLE_METHODS,
+    *FormattingFeatures.STYLE_PARAMETERS.values(),
+    *FormattingFeatures.AESTHETIC_ELEMENTS.values()
+)
+
+
+class FormattingVisitor(CachedNodeVisitor):
     """Visitor for analyzing visualization formatting."""
 
     def __init__(self):
@@ -72,12 +87,13 @@ class FormattingVisitor(ast.NodeVisitor):
         Args:
             node (ast.Call): The call node
         """
-        if isinstance(node.func, ast.Attribute):
+        # Calls of other methods cannot affect any of the checks below
+        if (isinstance(node.func, ast.Attribute)
+                and node.func.attr in _FORMATTING_METHODS):
             method_name = node.func.attr
-            base_obj = self._get_base_object(node.func.value)
-            
+
             # Track formatting calls
-            self._analyze_formatting_call(method_name, base_obj, node)
+            self._analyze_formatting_call(method_name, node)
             
             # Track style settings
             self._analyze_style_settings(method_name, node)
@@ -103,21 +119,23 @@ class FormattingVisitor(ast.NodeVisitor):
             return self._get_base_object(node.value)
         return ""
 
-    def _analyze_formatting_call(self, method_name: str, base_obj: str, node: ast.Call):
+    def _analyze_formatting_call(self, method_name: str, node: ast.Call):
         """
         Analyze formatting method calls.
 
         Args:
             method_name (str): The method name
-            base_obj (str): The base object name
             node (ast.Call): The call node
         """
         # Track figure creation and formatting
         if method_name == 'figure':
             self.current_figure = node.lineno
-            
+
+        base_obj = None
         for category, params in FormattingFeatures.STYLE_PARAMETERS.items():
             if method_name in params:
+                if base_obj is None:
+                    base_obj = self._get_base_object(node.func.value)
                 self.format_calls[category].append({
                     'method': method_name,
                     'base': base_obj,
@@ -137,8 +155,7 @@ class FormattingVisitor(ast.NodeVisitor):
             method_name (str): The method name
             node (ast.Call): The call node
         """
-        style_methods = {'set_style', 'style', 'set_context', 'set_palette'}
-        if method_name in style_methods:
+        if method_name in FormattingFeatures.STYLE_METHODS:
             self.style_settings[method_name].append({
                 'line': node.lineno,
                 'args': [self._extract_value(arg) for arg in node.args],
@@ -234,16 +251,37 @@ class VisualizationFormattingAnalyzer(BaseAnalyzer):
             'suggestions': []
         }
 
+    def _cache_config(self) -> Tuple[Any, ...]:
+        """
+        Get the analyzer settings that affect its results.
+
+        Returns:
+            Tuple[Any, ...]: Settings included in the cache key
+        """
+        return (
+            tuple((group, sorted(parameters)) for group, parameters in
+                  FormattingFeatures.STYLE_PARAMETERS.items()),
+            tuple(FormattingFeatures.RECOMMENDED_VALUES.items()),
+            tuple((element, sorted(methods)) for element, methods in
+                  FormattingFeatures.AESTHETIC_ELEMENTS.items()),
+            sorted(FormattingFeatures.STYLE_METHODS),
+            tuple(FormattingFeatures.PATTERN_WEIGHTS.items())
+        )
+
     def get_metric_type(self) -> str:
         """Get the type of metric this analyzer produces."""
         return 'business_intelligence'
 
-    def analyze(self, code: str) -> Dict[str, Any]:
+    def analyze(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze visualization formatting practices.
 
         Args:
             code (str): The code to analyze
+            context (Optional[AnalysisContext]): Parse results shared with
+                other analyzers of the same code
 
         Returns:
             Dict[str, Any]: Analysis results containing:
@@ -257,12 +295,19 @@ class VisualizationFormattingAnalyzer(BaseAnalyzer):
             ValueError: If code is invalid
         """
         try:
-            self.prepare_analysis(code)
+            context = self.prepare_analysis(code, context)
+
+            cache_key = self._cache_key(code)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                self.metrics = cached['details']['metrics']
+                return cached
+
             self._reset_metrics()
 
             # Parse the code
             try:
-                tree = ast.parse(code)
+                tree = context.tree
             except SyntaxError as e:
                 raise AnalysisError(f"Syntax error in code: {str(e)}")
 
@@ -277,12 +322,9 @@ class VisualizationFormattingAnalyzer(BaseAnalyzer):
             consistency_score = self._calculate_consistency_score(visitor)
 
             # Calculate overall score
-            overall_score = self._calculate_overall_score([
-                (basic_score, FormattingFeatures.PATTERN_WEIGHTS['basic_formatting']),
-                (readability_score, FormattingFeatures.PATTERN_WEIGHTS['readability']),
-                (aesthetics_score, FormattingFeatures.PATTERN_WEIGHTS['aesthetics']),
-                (consistency_score, FormattingFeatures.PATTERN_WEIGHTS['consistency'])
-            ])
+            overall_score = self._calculate_overall_score((
+                basic_score, readability_score, aesthetics_score, consistency_score
+            ))
 
             # Store metrics
             self.metrics['format_calls'] = dict(visitor.format_calls)
@@ -308,6 +350,7 @@ class VisualizationFormattingAnalyzer(BaseAnalyzer):
             if not self.validate_results(results):
                 raise AnalysisError("Invalid analysis results generated")
 
+            self._store_cached_result(cache_key, results)
             return results
 
         except Exception as e:
@@ -381,24 +424,17 @@ class VisualizationFormattingAnalyzer(BaseAnalyzer):
         inconsistencies = len(visitor.style_settings) - 1  # More than one style change
         return max(0, 100 - (inconsistencies * 20))
 
-    def _calculate_overall_score(self, scores_and_weights: List[tuple[float, float]]) -> float:
+    def _calculate_overall_score(self, scores: Tuple[float, ...]) -> float:
         """
         Calculate weighted average score.
 
         Args:
-            scores_and_weights: List of (score, weight) tuples
+            scores: Component scores, in the order of PATTERN_WEIGHTS
 
         Returns:
             float: Weighted average score (0-100)
         """
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for score, weight in scores_and_weights:
-            total_score += score * weight
-            total_weight += weight
-            
-        return round(total_score / total_weight if total_weight > 0 else 0, 2)
+        return self._weighted_score(scores, FormattingFeatures.PATTERN_WEIGHTS.values())
 
     def _generate_findings(self, visitor: FormattingVisitor) -> List[str]:
         """
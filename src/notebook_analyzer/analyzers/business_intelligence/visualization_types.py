@@ -10,9 +10,12 @@ Last Updated: 2025-02-17 23:56:57
 """
 
 import ast
-from typing import Dict, Any, List, Set, Optional
+import functools
+from typing import Dict, Any, List, Tuple, Optional
 from collections import defaultdict
 from ..base_analyzer import BaseAnalyzer, AnalysisError
+from ..analysis_context import AnalysisContext
+from ..node_visitor import CachedNodeVisitor
 
 
 class VisualizationFeatures:
@@ -49,6 +52,12 @@ class VisualizationFeatures:
         'correlation': {'scatter', 'heatmap'}
     }
     
+    # Methods that customize a plot
+    CUSTOMIZATION_METHODS = frozenset({
+        'set_title', 'set_xlabel', 'set_ylabel',
+        'set_figsize', 'grid', 'legend'
+    })
+    
     # Pattern weights for scoring
     PATTERN_WEIGHTS = {
         'library_usage': 0.2,
@@ -58,7 +67,46 @@ class VisualizationFeatures:
     }
 
 
-class VisualizationVisitor(ast.NodeVisitor):
+# Plotting libraries keyed by every name that identifies them, built once at import
+_LIBRARIES_BY_NAME = {
+    name: tuple(
+        lib for lib, aliases in VisualizationFeatures.PLOTTING_LIBRARIES.items()
+        if name in aliases or name == lib
+    )
+    for name in set(VisualizationFeatures.PLOTTING_LIBRARIES).union(
+        *VisualizationFeatures.PLOTTING_LIBRARIES.values()
+    )
+}
+
+# Every name the visitor reacts to; code containing none of them has no
+# visualization imports, plots or customizations
+_VISUALIZATION_NAMES = frozenset(_LIBRARIES_BY_NAME).union(
+    VisualizationFeatures.CUSTOMIZATION_METHODS,
+    *VisualizationFeatures.PLOT_TYPES.values()
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _plot_types_for(method_name: str) -> Tuple[str, ...]:
+    """
+    Get the plot types a method name refers to.
+
+    Notebooks call the same few methods over and over, so the substring
+    matching against PLOT_TYPES is done once per distinct name.
+
+    Args:
+        method_name (str): The called method name
+
+    Returns:
+        Tuple[str, ...]: Matching plot types, in PLOT_TYPES order
+    """
+    return tuple(
+        plot_type for plot_type, names in VisualizationFeatures.PLOT_TYPES.items()
+        if method_name in names or any(name in method_name for name in names)
+    )
+
+
+class VisualizationVisitor(CachedNodeVisitor):
     """Visitor for analyzing visualization code."""
 
     def __init__(self):
@@ -78,13 +126,12 @@ class VisualizationVisitor(ast.NodeVisitor):
             node (ast.Import): The import node
         """
         for name in node.names:
-            for lib, aliases in VisualizationFeatures.PLOTTING_LIBRARIES.items():
-                if name.name in aliases or name.name == lib:
-                    self.imports.add(lib)
-                    self.libraries[lib].append({
-                        'alias': name.asname or name.name,
-                        'line': node.lineno
-                    })
+            for lib in _LIBRARIES_BY_NAME.get(name.name, ()):
+                self.imports.add(lib)
+                self.libraries[lib].append({
+                    'alias': name.asname or name.name,
+                    'line': node.lineno
+                })
         self.generic_visit(node)
 
     def visit_ImportFrom(self, node: ast.ImportFrom):
@@ -113,14 +160,13 @@ class VisualizationVisitor(ast.NodeVisitor):
         if isinstance(node.func, ast.Attribute):
             # Check for plotting method calls
             method_name = node.func.attr
-            base_obj = self._get_base_object(node.func.value)
-            
+
             # Analyze plot type
-            self._analyze_plot_type(method_name, base_obj, node)
-            
+            self._analyze_plot_type(method_name, node)
+
             # Analyze customizations
-            self._analyze_customizations(node)
-            
+            self._analyze_customizations(method_name, node)
+
         self.generic_visit(node)
 
     def _get_base_object(self, node: ast.AST) -> str:
@@ -139,46 +185,42 @@ class VisualizationVisitor(ast.NodeVisitor):
             return self._get_base_object(node.value)
         return ""
 
-    def _analyze_plot_type(self, method_name: str, base_obj: str, node: ast.Call):
+    def _analyze_plot_type(self, method_name: str, node: ast.Call):
         """
         Analyze plot type and its appropriateness.
 
         Args:
             method_name (str): The plotting method name
-            base_obj (str): The base object name
             node (ast.Call): The call node
         """
-        for plot_type, names in VisualizationFeatures.PLOT_TYPES.items():
-            if method_name in names or any(name in method_name for name in names):
-                self.plots[plot_type].append({
-                    'method': method_name,
-                    'base': base_obj,
-                    'line': node.lineno,
-                    'args': len(node.args),
-                    'kwargs': {k.arg: self._extract_value(k.value) for k in node.keywords}
-                })
-                
-                # Check plot appropriateness
-                self._check_plot_appropriateness(plot_type, node)
+        base_obj = None
+        for plot_type in _plot_types_for(method_name):
+            if base_obj is None:
+                base_obj = self._get_base_object(node.func.value)
+            self.plots[plot_type].append({
+                'method': method_name,
+                'base': base_obj,
+                'line': node.lineno,
+                'args': len(node.args),
+                'kwargs': {k.arg: self._extract_value(k.value) for k in node.keywords}
+            })
 
-    def _analyze_customizations(self, node: ast.Call):
+            # Check plot appropriateness
+            self._check_plot_appropriateness(plot_type, node)
+
+    def _analyze_customizations(self, method_name: str, node: ast.Call):
         """
         Analyze plot customizations.
 
         Args:
+            method_name (str): The called method name
             node (ast.Call): The call node
         """
-        customization_methods = {
-            'set_title', 'set_xlabel', 'set_ylabel',
-            'set_figsize', 'grid', 'legend'
-        }
-        
-        if isinstance(node.func, ast.Attribute):
-            if node.func.attr in customization_methods:
-                self.customizations.append({
-                    'type': node.func.attr,
-                    'line': node.lineno
-                })
+        if method_name in VisualizationFeatures.CUSTOMIZATION_METHODS:
+            self.customizations.append({
+                'type': method_name,
+                'line': node.lineno
+            })
 
     def _check_plot_appropriateness(self, plot_type: str, node: ast.Call):
         """
@@ -248,16 +290,36 @@ class VisualizationTypesAnalyzer(BaseAnalyzer):
             'suggestions': []
         }
 
+    def _cache_config(self) -> Tuple[Any, ...]:
+        """
+        Get the analyzer settings that affect its results.
+
+        Returns:
+            Tuple[Any, ...]: Settings included in the cache key
+        """
+        return (
+            tuple((lib, sorted(aliases)) for lib, aliases in
+                  VisualizationFeatures.PLOTTING_LIBRARIES.items()),
+            tuple((plot, sorted(names)) for plot, names in
+                  VisualizationFeatures.PLOT_TYPES.items()),
+            sorted(VisualizationFeatures.CUSTOMIZATION_METHODS),
+            tuple(VisualizationFeatures.PATTERN_WEIGHTS.items())
+        )
+
     def get_metric_type(self) -> str:
         """Get the type of metric this analyzer produces."""
         return 'business_intelligence'
 
-    def analyze(self, code: str) -> Dict[str, Any]:
+    def analyze(
+        self, code: str, context: Optional[AnalysisContext] = None
+    ) -> Dict[str, Any]:
         """
         Analyze visualization types and practices.
 
         Args:
             code (str): The code to analyze
+            context (Optional[AnalysisContext]): Parse results shared with
+                other analyzers of the same code
 
         Returns:
             Dict[str, Any]: Analysis results containing:
@@ -271,18 +333,27 @@ class VisualizationTypesAnalyzer(BaseAnalyzer):
             ValueError: If code is invalid
         """
         try:
-            self.prepare_analysis(code)
+            context = self.prepare_analysis(code, context)
+
+            cache_key = self._cache_key(code)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                self.metrics = cached['details']['metrics']
+                return cached
+
             self._reset_metrics()
 
             # Parse the code
             try:
-                tree = ast.parse(code)
+                tree = context.tree
             except SyntaxError as e:
                 raise AnalysisError(f"Syntax error in code: {str(e)}")
 
-            # Analyze visualization code
+            # Analyze visualization code; code that never names a plotting
+            # library, plot type or customization is not walked
             visitor = VisualizationVisitor()
-            visitor.visit(tree)
+            if self._may_mention(code, _VISUALIZATION_NAMES):
+                visitor.visit(tree)
 
             # Calculate component scores
             library_score = self._calculate_library_score(visitor.libraries)
@@ -291,12 +362,9 @@ class VisualizationTypesAnalyzer(BaseAnalyzer):
             customization_score = self._calculate_customization_score(visitor.customizations)
 
             # Calculate overall score
-            overall_score = self._calculate_overall_score([
-                (library_score, VisualizationFeatures.PATTERN_WEIGHTS['library_usage']),
-                (variety_score, VisualizationFeatures.PATTERN_WEIGHTS['plot_variety']),
-                (appropriateness_score, VisualizationFeatures.PATTERN_WEIGHTS['plot_appropriateness']),
-                (customization_score, VisualizationFeatures.PATTERN_WEIGHTS['customization'])
-            ])
+            overall_score = self._calculate_overall_score((
+                library_score, variety_score, appropriateness_score, customization_score
+            ))
 
             # Store metrics
             self.metrics['libraries'] = dict(visitor.libraries)
@@ -322,6 +390,7 @@ class VisualizationTypesAnalyzer(BaseAnalyzer):
             if not self.validate_results(results):
                 raise AnalysisError("Invalid analysis results generated")
 
+            self._store_cached_result(cache_key, results)
             return results
 
         except Exception as e:
@@ -395,24 +464,17 @@ class VisualizationTypesAnalyzer(BaseAnalyzer):
         unique_customs = len({c['type'] for c in customizations})
         return min(100, 50 + (unique_customs * 10))
 
-    def _calculate_overall_score(self, scores_and_weights: List[tuple[float, float]]) -> float:
+    def _calculate_overall_score(self, scores: Tuple[float, ...]) -> float:
         """
         Calculate weighted average score.
 
         Args:
-            scores_and_weights: List of (score, weight) tuples
+            scores: Component scores, in the order of PATTERN_WEIGHTS
 
         Returns:
             float: Weighted average score (0-100)
         """
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for score, weight in scores_and_weights:
-            total_score += score * weight
-            total_weight += weight
-            
-        return round(total_score / total_weight if total_weight > 0 else 0, 2)
+        return self._weighted_score(scores, VisualizationFeatures.PATTERN_WEIGHTS.values())
 
     def _generate_findings(self, visitor: VisualizationVisitor) -> List[str]:
         """
@@ -0,0 +1,60 @@
+"""
+Node Visitor Module.
+
+This module provides an AST visitor base class with cached method dispatch
+for the analyzers' tree walks.
+
+Created by: Barrhann
+Created on: 2025-02-17
+"""
+
+import ast
+from typing import Any, Callable, Dict
+
+
+class CachedNodeVisitor(ast.NodeVisitor):
+    """
+    Drop-in replacement for ast.NodeVisitor with cached dispatch.
+
+    ast.NodeVisitor builds the 'visit_<ClassName>' string and looks it up with
+    getattr for every node it visits. This class resolves the handler once per
+    node type and visitor class, and walks children with ast.iter_child_nodes.
+    Subclasses define visit_* methods and override generic_visit as usual.
+    """
+
+    _handlers: Dict[type, Callable[..., Any]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """Give every visitor class its own handler table."""
+        super().__init_subclass__(**kwargs)
+        cls._handlers = {}
+
+    def visit(self, node: ast.AST) -> Any:
+        """
+        Visit a node.
+
+        Args:
+            node (ast.AST): The node to visit
+
+        Returns:
+            Any: Value returned by the node's handler
+        """
+        node_type = type(node)
+        handler = self._handlers.get(node_type)
+        if handler is None:
+            visitor_type = type(self)
+            handler = getattr(visitor_type, 'visit_' + node_type.__name__,
+                              visitor_type.generic_visit)
+            self._handlers[node_type] = handler
+        return handler(self, node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        """
+        Visit all children of a node.
+
+        Args:
+            node (ast.AST): The node whose children to visit
+        """
+        visit = self.visit
+        for child in ast.iter_child_nodes(node):
+            visit(child)
@@ -0,0 +1,41 @@
+"""
+Analysis Workers Module.
+
+This module holds the functions that run analyzers in worker processes. It
+imports nothing from the package, so a spawned worker can look the functions
+up without importing more than the analyzers it unpickles.
+
+Created by: Barrhann
+Created on: 2025-02-17
+"""
+
+from typing import Any, Dict, Tuple
+
+
+def analyze_cell(analyzer_type: type, code: str) -> Dict[str, Any]:
+    """
+    Analyze a single cell in a worker process.
+
+    Args:
+        analyzer_type (type): BaseAnalyzer subclass to analyze the cell with
+        code (str): The code to analyze
+
+    Returns:
+        Dict[str, Any]: Analysis results for the cell
+    """
+    return analyzer_type().analyze(code)
+
+
+def run_analyzer(analyzer: Any, code: str) -> Tuple[Dict[str, Any], Any]:
+    """
+    Run an analyzer on notebook code in a worker process.
+
+    Args:
+        analyzer (BaseAnalyzer): Worker copy of the analyzer
+        code (str): The notebook's combined code
+
+    Returns:
+        Tuple[Dict[str, Any], BaseAnalyzer]: Analysis results, and the
+            analyzer copy for merging its state back into the original
+    """
+    return analyzer.analyze(code), analyzer
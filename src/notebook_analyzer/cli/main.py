@@ -10,16 +10,18 @@ Last Updated: 2025-02-17 23:11:34
 """
 
 import argparse
-import sys
+import concurrent.futures
+import contextlib
+import functools
 import os
+import sys
 from typing import List, Optional
 from pathlib import Path
 
 from ..core.analysis_orchestrator import AnalysisOrchestrator
 from ..reporting import (
     create_report_generator,
-    get_available_formatters,
-    get_available_templates
+    get_available_formatters
 )
 
 
@@ -96,7 +98,8 @@ def parse_args(args: List[str]) -> argparse.Namespace:
         "--parallel",
         action="store_true",
         default=True,
-        help="Run analyzers in parallel (default: True)"
+        help="Run analyzers in parallel; with several notebooks, analyze the "
+             "notebooks in parallel instead (default: True)"
     )
 
     return parser.parse_args(args)
@@ -248,27 +251,37 @@ def main():
     if args.verbose:
         print(f"\nFound {len(notebooks)} notebook(s) to analyze")
 
-    for notebook in notebooks:
-        results = analyze_notebook(
-            notebook,
-            args.categories,
-            args.metrics,
-            args.verbose,
-            args.parallel
-        )
-        
-        if results:
-            report_path = generate_report(
-                results,
-                args.output_dir,
-                args.format,
-                notebook,
-                args.verbose
-            )
-            
-            if report_path:
-                print(f"\nAnalysis complete for {notebook}")
-                print(f"Report saved to: {report_path}")
+    analyze = functools.partial(
+        analyze_notebook,
+        categories=args.categories,
+        metrics=args.metrics,
+        verbose=args.verbose
+    )
+
+    with contextlib.ExitStack() as stack:
+        if args.parallel and len(notebooks) > 1:
+            # Notebooks are independent, so analyze them in worker processes;
+            # each runs its analyzers sequentially to avoid oversubscription
+            executor = stack.enter_context(concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, len(notebooks))
+            ))
+            all_results = executor.map(functools.partial(analyze, parallel=False), notebooks)
+        else:
+            all_results = (analyze(notebook, parallel=args.parallel) for notebook in notebooks)
+
+        for notebook, results in zip(notebooks, all_results):
+            if results:
+                report_path = generate_report(
+                    results,
+                    args.output_dir,
+                    args.format,
+                    notebook,
+                    args.verbose
+                )
+                
+                if report_path:
+                    print(f"\nAnalysis complete for {notebook}")
+                    print(f"Report saved to: {report_path}")
 
 
 if __name__ == "__main__":
@@ -9,16 +9,20 @@ Created on: 2025-02-17
 Last Updated: 2025-02-17 01:07:26
 """
 
-from typing import Dict, List, Any, Optional, Type
-from pathlib import Path
+from typing import Dict, List, Any
 import concurrent.futures
-from datetime import datetime
+import os
+import time
+from functools import cached_property
 
 from ..analyzers import (
+    AnalysisContext,
+    AnalysisError,
     BaseAnalyzer,
     builder_mindset,
     business_intelligence
 )
+from ..analyzers.workers import run_analyzer
 from .notebook_reader import NotebookReader
 
 
@@ -31,15 +35,39 @@ class AnalysisOrchestrator:
     - Coordinates multiple analyzers
     - Aggregates analysis results
     - Handles parallel execution
+
+    Code formatting dominates the run time, so worker processes only pay for
+    their start-up and for parsing the code once per analyzer on large
+    notebooks; smaller ones are analyzed sequentially with a shared context.
+
+    Attributes:
+        PARALLEL_MIN_LINES (int): Lines of code from which analyzers run in
+            worker processes when parallel analysis is requested
     """
 
+    PARALLEL_MIN_LINES = 5000
+
     def __init__(self):
         """Initialize the analysis orchestrator."""
         self.reader = NotebookReader()
-        self.analyzers = self._initialize_analyzers()
         self.results = {}
         self.errors = []
 
+    @cached_property
+    def analyzers(self) -> Dict[str, List[BaseAnalyzer]]:
+        """
+        Analyzer instances by category, created on first access.
+
+        Orchestrators that never run an analysis don't pay for setting up
+        every analyzer.
+        """
+        return self._initialize_analyzers()
+
+    @cached_property
+    def _total_analyzers(self) -> int:
+        """Number of analyzer instances, counted on first access."""
+        return sum(len(a) for a in self.analyzers.values())
+
     def _initialize_analyzers(self) -> Dict[str, List[BaseAnalyzer]]:
         """
         Initialize all available analyzers.
@@ -64,7 +92,8 @@ class AnalysisOrchestrator:
 
         Args:
             filepath (str): Path to the notebook file
-            parallel (bool): Whether to run analyzers in parallel
+            parallel (bool): Whether to run analyzers in parallel when the
+                notebook is large enough to benefit
 
         Returns:
             Dict[str, Any]: Analysis results from all analyzers
@@ -78,15 +107,14 @@ class AnalysisOrchestrator:
                 raise ValueError(f"Failed to read notebook: {filepath}")
 
             # Get notebook content
-            code_cells = list(self.reader.get_code_cells())
-            markdown_cells = list(self.reader.get_markdown_cells())
+            code = '\n\n'.join(self.reader.get_code_sources())
             metadata = self.reader.get_notebook_metadata()
 
             # Run analysis
-            if parallel:
-                results = self._run_parallel_analysis(code_cells, markdown_cells)
+            if parallel and self._worth_parallelizing(code):
+                results = self._run_parallel_analysis(code)
             else:
-                results = self._run_sequential_analysis(code_cells, markdown_cells)
+                results = self._run_sequential_analysis(code)
 
             # Aggregate results
             return self._aggregate_results(results, metadata)
@@ -95,61 +123,79 @@ class AnalysisOrchestrator:
             self.errors.append(str(e))
             raise ValueError(f"Analysis failed: {str(e)}")
 
-    def _run_parallel_analysis(
-        self, code_cells: List[Dict], markdown_cells: List[Dict]
-    ) -> Dict[str, Any]:
+    def _worth_parallelizing(self, code: str) -> bool:
+        """
+        Check whether running analyzers in worker processes would pay off.
+
+        Args:
+            code (str): The notebook's combined code
+
+        Returns:
+            bool: True if the code is long enough and several CPUs are available
+        """
+        return (
+            (os.cpu_count() or 1) > 1 and
+            code.count('\n') + 1 >= self.PARALLEL_MIN_LINES
+        )
+
+    def _run_parallel_analysis(self, code: str) -> Dict[str, Any]:
         """
         Run analyzers in parallel.
 
+        Each analyzer runs in a worker process, so the CPU-bound analyses are
+        not serialized by the GIL. Workers get a copy of the analyzer without
+        its result cache, and the copy's state is merged back afterwards.
+
         Args:
-            code_cells (List[Dict]): List of code cells
-            markdown_cells (List[Dict]): List of markdown cells
+            code (str): The notebook's combined code
 
         Returns:
             Dict[str, Any]: Analysis results from all analyzers
+
+        Raises:
+            AnalysisError: If a worker process dies
         """
         results = {}
-        with concurrent.futures.ThreadPoolExecutor() as executor:
+        with concurrent.futures.ProcessPoolExecutor() as executor:
             futures = {}
             
             # Submit analysis tasks
             for category, analyzers in self.analyzers.items():
                 for analyzer in analyzers:
-                    future = executor.submit(
-                        self._run_single_analyzer,
-                        analyzer,
-                        code_cells,
-                        markdown_cells
-                    )
-                    futures[future] = (category, analyzer.name)
+                    future = executor.submit(run_analyzer, analyzer, code)
+                    futures[future] = (category, analyzer)
 
             # Collect results
             for future in concurrent.futures.as_completed(futures):
-                category, name = futures[future]
+                category, analyzer = futures[future]
                 try:
-                    result = future.result()
-                    if category not in results:
-                        results[category] = {}
-                    results[category][name] = result
+                    result, worker_copy = future.result()
+                except concurrent.futures.BrokenExecutor as e:
+                    raise AnalysisError(
+                        f"Worker process failed running {category}/{analyzer.name}: {str(e)}"
+                    ) from e
                 except Exception as e:
-                    self.errors.append(f"Error in {category}/{name}: {str(e)}")
+                    self.errors.append(f"Error in {category}/{analyzer.name}: {str(e)}")
+                    continue
+                analyzer.merge_state(worker_copy)
+                if category not in results:
+                    results[category] = {}
+                results[category][analyzer.name] = result
 
         return results
 
-    def _run_sequential_analysis(
-        self, code_cells: List[Dict], markdown_cells: List[Dict]
-    ) -> Dict[str, Any]:
+    def _run_sequential_analysis(self, code: str) -> Dict[str, Any]:
         """
         Run analyzers sequentially.
 
         Args:
-            code_cells (List[Dict]): List of code cells
-            markdown_cells (List[Dict]): List of markdown cells
+            code (str): The notebook's combined code
 
         Returns:
             Dict[str, Any]: Analysis results from all analyzers
         """
         results = {}
+        context = AnalysisContext(code)
         
         for category, analyzers in self.analyzers.items():
             results[category] = {}
@@ -157,8 +203,7 @@ class AnalysisOrchestrator:
                 try:
                     results[category][analyzer.name] = self._run_single_analyzer(
                         analyzer,
-                        code_cells,
-                        markdown_cells
+                        context
                     )
                 except Exception as e:
                     self.errors.append(f"Error in {category}/{analyzer.name}: {str(e)}")
@@ -168,25 +213,19 @@ class AnalysisOrchestrator:
     def _run_single_analyzer(
         self,
         analyzer: BaseAnalyzer,
-        code_cells: List[Dict],
-        markdown_cells: List[Dict]
+        context: AnalysisContext
     ) -> Dict[str, Any]:
         """
         Run a single analyzer on notebook content.
 
         Args:
             analyzer (BaseAnalyzer): Analyzer instance
-            code_cells (List[Dict]): List of code cells
-            markdown_cells (List[Dict]): List of markdown cells
+            context (AnalysisContext): Shared context for the notebook's code
 
         Returns:
             Dict[str, Any]: Analysis results from the analyzer
         """
-        # Extract code from cells
-        code = '\n\n'.join(cell['source'] for cell in code_cells)
-        
-        # Run analysis
-        return analyzer.analyze(code)
+        return analyzer.analyze(context.code, context)
 
     def _aggregate_results(
         self,
@@ -205,12 +244,10 @@ class AnalysisOrchestrator:
         """
         return {
             'metadata': metadata,
-            'analysis_timestamp': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+            'analysis_timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()),
             'results': results,
             'summary': {
-                'total_analyzers': sum(
-                    len(analyzers) for analyzers in self.analyzers.values()
-                ),
+                'total_analyzers': self._total_analyzers,
                 'categories': list(results.keys()),
                 'errors': self.errors,
                 'overall_score': self._calculate_overall_score(results)
@@ -269,11 +306,12 @@ class AnalysisOrchestrator:
     def __str__(self) -> str:
         """Return string representation of the orchestrator."""
         return (f"AnalysisOrchestrator("
-                f"analyzers={sum(len(a) for a in self.analyzers.values())})")
+                f"analyzers={self._total_analyzers})")
 
     def __repr__(self) -> str:
         """Return detailed string representation of the orchestrator."""
         return (f"AnalysisOrchestrator("
                 f"categories={list(self.analyzers.keys())}, "
-                f"total_analyzers={sum(len(a) for a in self.analyzers.values())}, "
+                f"total_analyzers={self._total_analyzers}, "
                 f"errors={len(self.errors)})")
+
@@ -86,6 +86,21 @@ class NotebookReader:
                     'metadata': cell.metadata
                 }
 
+    def get_code_sources(self) -> List[str]:
+        """
+        Get the source code of all code cells in the notebook.
+
+        Use this instead of get_code_cells when only the code is needed; it
+        does not build a dictionary per cell.
+
+        Returns:
+            List[str]: Source of each code cell, in notebook order
+        """
+        if not self.notebook:
+            raise ValueError("No notebook loaded")
+
+        return [cell.source for cell in self.notebook.cells if cell.cell_type == 'code']
+
     def get_markdown_cells(self) -> Generator[Dict[str, Any], None, None]:
         """
         Get all markdown cells from the notebook.
@@ -10,7 +10,7 @@ Last Updated: 2025-02-17 01:11:10
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any
 from datetime import datetime
 
 
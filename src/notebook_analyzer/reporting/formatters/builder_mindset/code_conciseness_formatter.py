@@ -9,7 +9,7 @@ Created on: 2025-02-17
 Last Updated: 2025-02-17 01:20:27
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any
 from ....models import ReportSection, MetricBlock
 
 
@@ -9,7 +9,7 @@ Created on: 2025-02-17
 Last Updated: 2025-02-17 01:25:53
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any
 from ....models import ReportSection, MetricBlock
 
 
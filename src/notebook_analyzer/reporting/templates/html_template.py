@@ -9,7 +9,7 @@ Created on: 2025-02-17
 Last Updated: 2025-02-17 01:35:25
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any
 from jinja2 import Template
 import json
 
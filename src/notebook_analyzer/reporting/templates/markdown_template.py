@@ -1,7 +1,4 @@
 from typing import Dict, Any, List
-import json
-import base64
-import io
 import os
 from datetime import datetime
 import matplotlib.pyplot as plt
@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the notebook analyzer tests.
+"""
+
+import nbformat
+import pytest
+
+# Cells touching every analyzer: imports, functions, joins, plots and comments
+SAMPLE_CELLS = [
+    "import pandas as pd\nimport matplotlib.pyplot as plt\nimport seaborn as sns",
+    "# Load the raw data\nsales = pd.read_csv('sales.csv')\n"
+    "customers = pd.read_csv('customers.csv')",
+    "def clean(df):\n"
+    "    \"\"\"Drop incomplete rows.\"\"\"\n"
+    "    return df.dropna()\n"
+    "\n"
+    "class Report:\n"
+    "    def __init__(self, data):\n"
+    "        self.data = data\n"
+    "\n"
+    "    def total(self):\n"
+    "        return sum([x for x in self.data['amount']])",
+    "merged = pd.merge(clean(sales), clean(customers), on='customer_id', how='left')\n"
+    "# TODO: check for duplicate customers\n"
+    "joined = sales.join(customers.set_index('customer_id'), on='customer_id')",
+    "fig, ax = plt.subplots(figsize=(10, 6))\n"
+    "ax.bar(merged['region'], merged['amount'])\n"
+    "ax.set_title('Sales by region')\n"
+    "ax.set_xlabel('Region')\n"
+    "plt.show()\n"
+    "sns.heatmap(merged.corr())",
+    "result = [row for row in merged.itertuples() if row.amount > 100 and row.region == 'north' and row.customer_id is not None]",
+]
+
+
+@pytest.fixture
+def sample_code():
+    """Combined code of the sample notebook, as the orchestrator joins it."""
+    return '\n\n'.join(SAMPLE_CELLS)
+
+
+@pytest.fixture
+def notebook_path(tmp_path):
+    """Path to a notebook file holding the sample cells."""
+    notebook = nbformat.v4.new_notebook()
+    notebook.cells = [nbformat.v4.new_code_cell(source) for source in SAMPLE_CELLS]
+    path = tmp_path / 'sample.ipynb'
+    nbformat.write(notebook, str(path))
+    return path
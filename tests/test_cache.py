@@ -0,0 +1,130 @@
+"""
+Tests for the analyzer result caches.
+"""
+
+import os
+import pickle
+
+import pytest
+
+from notebook_analyzer.analyzers import (
+    AdvancedTechniquesAnalyzer,
+    CodeCommentsAnalyzer,
+    CodeConcisenessAnalyzer,
+    CodeFormattingAnalyzer,
+    CodeReusabilityAnalyzer,
+    VisualizationFormattingAnalyzer,
+    VisualizationTypesAnalyzer
+)
+
+CACHING_ANALYZERS = [
+    AdvancedTechniquesAnalyzer,
+    CodeCommentsAnalyzer,
+    CodeConcisenessAnalyzer,
+    CodeFormattingAnalyzer,
+    CodeReusabilityAnalyzer,
+    VisualizationFormattingAnalyzer,
+    VisualizationTypesAnalyzer
+]
+
+needs_uid = pytest.mark.skipif(not hasattr(os, 'getuid'), reason="no file ownership")
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Private disk cache directory, enabled through NA_CACHE_DIR."""
+    path = tmp_path / 'cache'
+    path.mkdir(mode=0o700)
+    monkeypatch.setenv('NA_CACHE_DIR', str(path))
+    return path
+
+
+def _disk_hit(analyzer_type, code):
+    """Look code up in the disk cache through a fresh analyzer."""
+    analyzer = analyzer_type()
+    return analyzer._get_cached_result(analyzer._cache_key(code))
+
+
+@pytest.mark.parametrize('analyzer_type', CACHING_ANALYZERS)
+def test_cache_hit_matches_analysis(analyzer_type, sample_code):
+    """A cached result and the metrics it restores match a fresh analysis."""
+    analyzer = analyzer_type()
+    first = analyzer.analyze(sample_code)
+    metrics = analyzer.metrics
+
+    second = analyzer.analyze(sample_code)
+    assert second == first
+    assert second is not first
+    assert analyzer.metrics == metrics
+
+
+def test_disk_cache_round_trip(cache_dir, sample_code):
+    """Results stored on disk are loaded by another analyzer instance."""
+    results = CodeFormattingAnalyzer().analyze(sample_code)
+
+    files = list(cache_dir.glob('*.pkl'))
+    assert len(files) == 1
+    assert files[0].stat().st_mode & 0o777 == 0o600
+    assert _disk_hit(CodeFormattingAnalyzer, sample_code) == results
+
+
+@needs_uid
+def test_disk_cache_rejects_writable_file(cache_dir, sample_code):
+    """Files others could have written are not unpickled."""
+    CodeFormattingAnalyzer().analyze(sample_code)
+    for path in cache_dir.glob('*.pkl'):
+        path.chmod(0o666)
+
+    assert _disk_hit(CodeFormattingAnalyzer, sample_code) is None
+
+
+@needs_uid
+def test_disk_cache_rejects_writable_directory(cache_dir, sample_code):
+    """Nothing is loaded from a directory others can write to."""
+    CodeFormattingAnalyzer().analyze(sample_code)
+    cache_dir.chmod(0o770)
+
+    assert _disk_hit(CodeFormattingAnalyzer, sample_code) is None
+
+
+@needs_uid
+def test_disk_cache_rejects_foreign_owner(cache_dir, sample_code, monkeypatch):
+    """Files owned by another user are not unpickled."""
+    CodeFormattingAnalyzer().analyze(sample_code)
+    uid = os.getuid()
+    monkeypatch.setattr(os, 'getuid', lambda: uid + 1)
+
+    assert _disk_hit(CodeFormattingAnalyzer, sample_code) is None
+
+
+def test_disk_cache_keeps_recently_used_files(cache_dir, monkeypatch):
+    """The disk cache is pruned to DISK_CACHE_SIZE, oldest files first."""
+    monkeypatch.setattr(CodeFormattingAnalyzer, 'DISK_CACHE_SIZE', 2)
+    codes = [f"value = {i}\n" for i in range(3)]
+    for i, code in enumerate(codes[:2]):
+        CodeFormattingAnalyzer().analyze(code)
+        path = next(p for p in cache_dir.glob('*.pkl') if p.stat().st_mtime > 1000)
+        os.utime(path, (1000 + i, 1000 + i))  # Fix the order of use
+
+    assert _disk_hit(CodeFormattingAnalyzer, codes[0]) is not None  # Now most recent
+    CodeFormattingAnalyzer().analyze(codes[2])
+
+    assert len(list(cache_dir.glob('*.pkl'))) == 2
+    assert _disk_hit(CodeFormattingAnalyzer, codes[0]) is not None
+    assert _disk_hit(CodeFormattingAnalyzer, codes[1]) is None
+
+
+def test_worker_copy_returns_its_cache(sample_code):
+    """An analyzer's cache stays home; a copy's new entries come back."""
+    analyzer = CodeFormattingAnalyzer()
+    analyzer.analyze("value = 1\n")
+
+    worker_copy = pickle.loads(pickle.dumps(analyzer))
+    assert not worker_copy._cache
+    results = worker_copy.analyze(sample_code)
+
+    analyzer.merge_state(pickle.loads(pickle.dumps(worker_copy)))
+    assert len(analyzer._cache) == 2
+    assert analyzer.analysis_count == 2
+    assert not hasattr(analyzer, '_is_copy')
+    assert analyzer._get_cached_result(analyzer._cache_key(sample_code)) == results
@@ -0,0 +1,24 @@
+"""
+Tests for CodeCommentsAnalyzer.
+"""
+
+from notebook_analyzer.analyzers import CodeCommentsAnalyzer
+
+
+def test_comment_start_checks_search_the_whole_comment():
+    """Any '#' in a comment is checked, and both issues can apply to one line."""
+    code = (
+        "x = 1  # Use x#y here\n"
+        "## Section\n"
+        "#!special and #lower\n"
+        "#Good\n"
+    )
+    analyzer = CodeCommentsAnalyzer()
+    analyzer.analyze(code)
+
+    assert analyzer.metrics['comment_quality'] == [
+        "Line 1: Comment should start with capital letter",
+        "Line 2: Avoid special characters at start of comment",
+        "Line 3: Comment should start with capital letter",
+        "Line 3: Avoid special characters at start of comment",
+    ]
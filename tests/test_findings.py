@@ -0,0 +1,28 @@
+"""
+Tests that analyzers report every issue they find.
+"""
+
+from notebook_analyzer.analyzers import CodeConcisenessAnalyzer, CodeFormattingAnalyzer
+
+ISSUE_LINES = 40
+
+
+def test_conciseness_reports_every_long_line():
+    """Each long line is its own finding, with a suggestion."""
+    code = '\n'.join(
+        f"value_{i} = {' + '.join(['1'] * 40)}" for i in range(ISSUE_LINES)
+    )
+    results = CodeConcisenessAnalyzer().analyze(code)
+
+    long_lines = [f for f in results['findings'] if 'is too long' in f]
+    assert len(long_lines) == ISSUE_LINES
+    assert f"Line {ISSUE_LINES} is too long" in long_lines[-1]
+    assert len(results['suggestions']) >= ISSUE_LINES
+
+
+def test_formatting_reports_every_whitespace_issue():
+    """Per-line formatting issues are not sampled."""
+    code = '\n'.join(f"value_{i} = 1  " for i in range(ISSUE_LINES))
+    results = CodeFormattingAnalyzer().analyze(code)
+
+    assert len(results['details']['metrics']['whitespace_issues']) == ISSUE_LINES
@@ -0,0 +1,53 @@
+"""
+Import smoke tests.
+
+Every module of the package is imported in a fresh interpreter, so a
+circular import cannot hide behind modules an earlier test already loaded.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import notebook_analyzer
+
+PACKAGE_DIR = Path(notebook_analyzer.__file__).parent
+
+
+def _module_names():
+    """List the dotted names of all modules in the package."""
+    names = []
+    for path in sorted(PACKAGE_DIR.rglob('*.py')):
+        parts = path.relative_to(PACKAGE_DIR.parent).with_suffix('').parts
+        if parts[-1] == '__init__':
+            parts = parts[:-1]
+        names.append('.'.join(parts))
+    return names
+
+
+@pytest.mark.parametrize('module_name', _module_names())
+def test_module_imports(module_name):
+    """Each module imports on its own."""
+    completed = subprocess.run(
+        [sys.executable, '-c', f'import {module_name}'],
+        capture_output=True,
+        text=True
+    )
+    assert completed.returncode == 0, completed.stderr
+
+
+def test_lazy_package_attributes():
+    """Every name in __all__ resolves through the package's lazy imports."""
+    completed = subprocess.run(
+        [
+            sys.executable, '-c',
+            'import notebook_analyzer as na\n'
+            'for name in na.__all__:\n'
+            '    getattr(na, name)'
+        ],
+        capture_output=True,
+        text=True
+    )
+    assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,67 @@
+"""
+Tests for running analyzers through the AnalysisOrchestrator.
+"""
+
+import concurrent.futures
+import functools
+import multiprocessing
+import os
+
+import pytest
+
+from notebook_analyzer.analyzers import AnalysisError
+from notebook_analyzer.core import AnalysisOrchestrator
+from notebook_analyzer.core import analysis_orchestrator
+
+
+@pytest.fixture
+def spawn_pool(monkeypatch):
+    """Force worker pools to use the spawn start method."""
+    monkeypatch.setattr(
+        concurrent.futures,
+        'ProcessPoolExecutor',
+        functools.partial(
+            concurrent.futures.ProcessPoolExecutor,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    )
+
+
+def _crash_worker(analyzer, code):
+    """Stand-in for the worker function that kills its process."""
+    os._exit(1)
+
+
+def test_parallel_matches_sequential_under_spawn(sample_code, spawn_pool):
+    """Analyzers running in spawned workers return the sequential results."""
+    orchestrator = AnalysisOrchestrator()
+    sequential = orchestrator._run_sequential_analysis(sample_code)
+    parallel = orchestrator._run_parallel_analysis(sample_code)
+
+    assert not orchestrator.errors
+    assert parallel == sequential
+    assert all(
+        analyzer.analysis_count == 2
+        for analyzers in orchestrator.analyzers.values()
+        for analyzer in analyzers
+    )
+
+
+def test_broken_pool_raises(sample_code, spawn_pool, monkeypatch):
+    """A dead worker process is an error, not an empty result."""
+    monkeypatch.setattr(analysis_orchestrator, 'run_analyzer', _crash_worker)
+    with pytest.raises(AnalysisError, match='Worker process failed'):
+        AnalysisOrchestrator()._run_parallel_analysis(sample_code)
+
+
+def test_small_notebooks_run_sequentially(notebook_path, monkeypatch):
+    """Notebooks below the size threshold never start a worker pool."""
+    def no_pool(*args, **kwargs):
+        raise AssertionError("worker pool started")
+
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', no_pool)
+    results = AnalysisOrchestrator().analyze_notebook(str(notebook_path), parallel=True)
+
+    assert not results['summary']['errors']
+    assert len(results['results']['builder_mindset']) == 7
+    assert len(results['results']['business_intelligence']) == 2
@@ -0,0 +1,49 @@
+"""
+Tests for the analyzers' weighted overall scores.
+"""
+
+import math
+
+import pytest
+
+from notebook_analyzer.analyzers import (
+    AdvancedTechniquesAnalyzer,
+    BaseAnalyzer,
+    CodeCommentsAnalyzer,
+    CodeConcisenessAnalyzer,
+    CodeFormattingAnalyzer,
+    CodeReusabilityAnalyzer,
+    CodeStructureAnalyzer,
+    VisualizationFormattingAnalyzer,
+    VisualizationTypesAnalyzer
+)
+
+WEIGHTED_ANALYZERS = [
+    AdvancedTechniquesAnalyzer,
+    CodeCommentsAnalyzer,
+    CodeConcisenessAnalyzer,
+    CodeFormattingAnalyzer,
+    CodeReusabilityAnalyzer,
+    CodeStructureAnalyzer,
+    VisualizationFormattingAnalyzer,
+    VisualizationTypesAnalyzer
+]
+
+
+@pytest.mark.parametrize('analyzer_type', WEIGHTED_ANALYZERS)
+def test_weights_match_component_scores(analyzer_type, sample_code, monkeypatch):
+    """Each analyzer has one weight per component score, summing to 1."""
+    calls = []
+    weighted_score = BaseAnalyzer._weighted_score
+
+    def record(scores, weights):
+        calls.append((tuple(scores), tuple(weights)))
+        return weighted_score(scores, weights)
+
+    monkeypatch.setattr(BaseAnalyzer, '_weighted_score', staticmethod(record))
+    analyzer_type().analyze(sample_code)
+
+    assert len(calls) == 1
+    scores, weights = calls[0]
+    assert len(weights) == len(scores)
+    assert math.isclose(sum(weights), 1.0)